@@ -196,8 +196,8 @@ def render(
                 if base and ".." in base:
                     range_display = base
                 else:
-                    detected = ChangesSet.detect_base(effective_repo_path) if base is None else base
-                    range_display = f"{detected[:12]}..HEAD"
+                    resolved_base = changes_set.base or ""
+                    range_display = f"{resolved_base[:12]}..HEAD"
                 console.print(f"[cyan]Validating changes: {range_display}[/cyan]")
             except RuntimeError as e:
                 console.print(f"[red]✗ Failed to get diff: {e}[/red]")
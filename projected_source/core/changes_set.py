@@ -6,15 +6,23 @@ with support for merging overlapping regions and tracking which regions
 have been "claimed" by documentation.
 """
 
+import os
+import re
 import subprocess
+import tempfile
+from array import array
+from bisect import bisect_left, bisect_right
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
 
+# New-file range and old line count of a hunk header
+_HUNK_RE = re.compile(rb"@@ -\d+(?:,(\d+))? \+(\d+)(?:,(\d+))? @@")
 
-@dataclass
+
+@dataclass(slots=True, frozen=True)
 class ChangeRegion:
-    """A contiguous region of changed code in a file."""
+    """A contiguous region of changed code in a file; immutable and hashable."""
 
     file_path: Path
     start_line: int
@@ -24,6 +32,27 @@ class ChangeRegion:
         return f"{self.file_path}:{self.start_line}-{self.end_line}"
 
 
+class _Intervals:
+    """
+    Sorted, disjoint line ranges of one file, stored as parallel arrays of starts and ends.
+
+    Two int arrays hold a region in 8 bytes instead of a tuple and two int objects, and
+    both are sorted, so lookups bisect them directly.
+    """
+
+    __slots__ = ("starts", "ends")
+
+    def __init__(self):
+        self.starts = array("i")
+        self.ends = array("i")
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def __iter__(self) -> Iterator[Tuple[int, int]]:
+        return zip(self.starts, self.ends)
+
+
 class ChangesSet:
     """
     Set-like structure for tracking changed code regions.
@@ -34,8 +63,12 @@ class ChangesSet:
     """
 
     def __init__(self):
-        # Dict[Path, List[Tuple[start, end]]] - sorted, non-overlapping regions
-        self._regions: Dict[Path, List[Tuple[int, int]]] = {}
+        # Path -> sorted, non-overlapping, non-adjacent regions of that file
+        self._regions: Dict[Path, _Intervals] = {}
+        # Number of regions across all files, kept up to date by every mutation
+        self._total = 0
+        # Base commit or range the regions were diffed against, set by from_diff
+        self.base: Optional[str] = None
 
     @classmethod
     def from_diff(cls, base: Optional[str] = None, repo_path: Optional[Path] = None) -> "ChangesSet":
@@ -57,19 +90,25 @@ class ChangesSet:
         diff_range = base if ".." in base else f"{base}..HEAD"
 
         changes = cls()
+        # Keep the resolved base so callers can report it without running merge-base again
+        changes.base = base
+
+        # Get diff with file names and line numbers, parsing it as git writes it. stderr
+        # goes to a file so a chatty git cannot block on a full pipe while stdout is read.
+        with tempfile.TemporaryFile() as stderr:
+            with subprocess.Popen(
+                ["git", "diff", diff_range, "--unified=3", "--no-color"],
+                stdout=subprocess.PIPE,
+                stderr=stderr,
+                cwd=repo_path,
+            ) as process:
+                assert process.stdout is not None  # stdout=PIPE
+                changes._parse_diff(process.stdout, repo_path)
+
+            if process.returncode != 0:
+                stderr.seek(0)
+                raise RuntimeError(f"git diff failed: {stderr.read().decode('utf8', 'replace')}")
 
-        # Get diff with file names and line numbers
-        result = subprocess.run(
-            ["git", "diff", diff_range, "--unified=3"],
-            capture_output=True,
-            cwd=repo_path,
-            text=True,
-        )
-
-        if result.returncode != 0:
-            raise RuntimeError(f"git diff failed: {result.stderr}")
-
-        changes._parse_diff(result.stdout, repo_path)
         return changes
 
     @staticmethod
@@ -102,46 +141,83 @@ class ChangesSet:
         # Fall back to parent commit
         return "HEAD~1"
 
-    def _parse_diff(self, diff_output: str, repo_path: Path) -> None:
-        """Parse unified diff output and populate regions."""
-        current_file: Optional[Path] = None
-        current_new_line = 0
+    def _parse_diff(self, diff_output: Union[str, Iterable[bytes]], repo_path: Path) -> None:
+        """
+        Parse unified diff output and populate regions.
+
+        A hunk's new-file range covers exactly its added and context lines, so regions
+        come from the hunk headers alone and are loaded in one batch instead of added
+        line by line. Hunk bodies are counted off against the header's line counts, so no
+        body line is ever taken for a header.
 
-        for line in diff_output.splitlines():
-            # New file header: +++ b/path/to/file
-            if line.startswith("+++ b/"):
-                file_path = line[6:]  # Strip "+++ b/"
-                current_file = repo_path / file_path
+        Args:
+            diff_output: Diff text, or its raw lines (e.g. a git process's stdout)
+            repo_path: Directory the diff's paths are relative to
+        """
+        lines = diff_output.encode("utf8").split(b"\n") if isinstance(diff_output, str) else diff_output
+
+        per_file: Dict[Path, List[Tuple[int, int]]] = {}
+        current: Optional[List[Tuple[int, int]]] = None
+        old_left = new_left = 0
+
+        for line in lines:
+            # Hunk body: context lines count against both sides, the others against one
+            if old_left > 0 or new_left > 0:
+                tag = line[:1]
+                if tag == b"+":
+                    new_left -= 1
+                elif tag == b"-":
+                    old_left -= 1
+                elif tag != b"\\":  # "\ No newline at end of file" counts against neither
+                    old_left -= 1
+                    new_left -= 1
 
             # Hunk header: @@ -old_start,old_count +new_start,new_count @@
-            elif line.startswith("@@"):
-                # Parse new file position
-                parts = line.split()
-                if len(parts) >= 3:
-                    new_range = parts[2]  # e.g., "+10,5" or "+10"
-                    if new_range.startswith("+"):
-                        new_range = new_range[1:]
-                        if "," in new_range:
-                            current_new_line = int(new_range.split(",")[0])
-                        else:
-                            current_new_line = int(new_range)
-
-            # Added or context line - track position
-            elif current_file and not line.startswith("-"):
-                if line.startswith("+") or line.startswith(" "):
-                    # This line exists in the new version
-                    if line.startswith("+"):
-                        # Added line - definitely needs coverage
-                        self.add(current_file, current_new_line, current_new_line)
-                    elif line.startswith(" "):
-                        # Context line around a change - also needs coverage
-                        # (user chose "all changed" which includes context)
-                        self.add(current_file, current_new_line, current_new_line)
-                    current_new_line += 1
-
-            # Deleted line - doesn't increment new line counter
-            elif line.startswith("-") and not line.startswith("---"):
-                pass  # Deletion - surrounding context already captured
+            elif line.startswith(b"@@"):
+                match = _HUNK_RE.match(line)
+                if match is None:
+                    continue
+                old_left = int(match[1]) if match[1] is not None else 1
+                start = int(match[2])
+                new_left = int(match[3]) if match[3] is not None else 1
+                if new_left and current is not None:
+                    current.append((start, start + new_left - 1))
+
+            # New file header: +++ b/path/to/file, or +++ /dev/null for a deleted file
+            elif line.startswith(b"+++ "):
+                path = line[4:].rstrip(b"\n")
+                current = per_file.setdefault(repo_path / os.fsdecode(path[2:]), []) if path[:2] == b"b/" else None
+
+        self._bulk_load(per_file)
+
+    def _bulk_load(self, per_file: Dict[Path, List[Tuple[int, int]]]) -> None:
+        """
+        Add many regions at once: each file's regions are sorted and merged in one pass.
+
+        Args:
+            per_file: Regions to add, as (start, end) line pairs per file
+        """
+        for file_path, pairs in per_file.items():
+            if not pairs:
+                continue
+            existing = self._regions.get(file_path)
+            if existing is not None:
+                pairs = pairs + list(existing)
+                self._total -= len(existing)
+            pairs.sort()
+
+            regions = _Intervals()
+            starts, ends = regions.starts, regions.ends
+            for start, end in pairs:
+                if starts and start <= ends[-1] + 1:
+                    # Overlapping or adjacent - merge
+                    if end > ends[-1]:
+                        ends[-1] = end
+                else:
+                    starts.append(start)
+                    ends.append(end)
+            self._regions[file_path] = regions
+            self._total += len(regions)
 
     def add(self, file_path: Path, start: int, end: int) -> None:
         """
@@ -155,26 +231,23 @@ class ChangesSet:
         if start > end:
             start, end = end, start
 
-        regions = self._regions.setdefault(file_path, [])
+        regions = self._regions.get(file_path)
+        if regions is None:
+            regions = self._regions[file_path] = _Intervals()
+        starts, ends = regions.starts, regions.ends
 
-        # Add new region and re-merge everything
-        regions.append((start, end))
-        self._regions[file_path] = self._merge_sorted(sorted(regions))
+        # Regions are sorted and disjoint, so the ones to merge with (overlapping or
+        # adjacent) form one run: from the first ending at or after start - 1 up to the
+        # last starting at or before end + 1
+        lo = bisect_left(ends, start - 1)
+        hi = bisect_right(starts, end + 1)
 
-    def _merge_sorted(self, regions: List[Tuple[int, int]]) -> List[Tuple[int, int]]:
-        """Merge a sorted list of potentially overlapping regions."""
-        if not regions:
-            return []
-
-        result = [regions[0]]
-        for start, end in regions[1:]:
-            last_start, last_end = result[-1]
-            if start <= last_end + 1:
-                # Overlapping or adjacent - merge
-                result[-1] = (last_start, max(last_end, end))
-            else:
-                result.append((start, end))
-        return result
+        if lo < hi:
+            start = min(start, starts[lo])
+            end = max(end, ends[hi - 1])
+        starts[lo:hi] = array("i", (start,))
+        ends[lo:hi] = array("i", (end,))
+        self._total += 1 - (hi - lo)
 
     def subtract(self, file_path: Path, start: int, end: int) -> None:
         """
@@ -193,26 +266,81 @@ class ChangesSet:
         if start > end:
             start, end = end, start
 
-        new_regions: List[Tuple[int, int]] = []
+        regions = self._regions[file_path]
+        starts, ends = regions.starts, regions.ends
+
+        # The overlapped regions form one run: from the first ending at or after start up
+        # to the last starting at or before end. Only that run is rewritten.
+        lo = bisect_left(ends, start)
+        hi = bisect_right(starts, end)
+        if lo >= hi:
+            return  # No overlap - nothing to remove
+
+        # Only the run's outer regions can keep a remainder; inner ones are fully covered
+        new_starts = array("i")
+        new_ends = array("i")
+        # Left remainder
+        if starts[lo] < start:
+            new_starts.append(starts[lo])
+            new_ends.append(start - 1)
+        # Right remainder
+        if ends[hi - 1] > end:
+            new_starts.append(end + 1)
+            new_ends.append(ends[hi - 1])
+
+        starts[lo:hi] = new_starts
+        ends[lo:hi] = new_ends
+        self._total += len(new_starts) - (hi - lo)
 
-        for reg_start, reg_end in self._regions[file_path]:
-            # No overlap - keep as is
-            if end < reg_start or start > reg_end:
-                new_regions.append((reg_start, reg_end))
+        if not regions:
+            del self._regions[file_path]
+
+    def subtract_many(self, file_path: Path, claims: Iterable[Tuple[int, int]]) -> None:
+        """
+        Remove many regions of one file at once.
 
-            # Full coverage - remove entirely
-            elif start <= reg_start and end >= reg_end:
-                pass  # Don't add it
+        Equivalent to calling subtract() for each claim, but the claims are sorted once and
+        swept against the file's regions in a single pass, instead of splicing the region
+        arrays once per claim.
+
+        Args:
+            file_path: Path to the file
+            claims: (start, end) line pairs (1-based, inclusive)
+        """
+        regions = self._regions.get(file_path)
+        if regions is None:
+            return
 
-            # Partial overlap - may need to split
-            else:
-                # Left remainder
-                if reg_start < start:
-                    new_regions.append((reg_start, start - 1))
-                # Right remainder
-                if reg_end > end:
-                    new_regions.append((end + 1, reg_end))
+        claims = sorted((start, end) if start <= end else (end, start) for start, end in claims)
+        if not claims:
+            return
 
+        new_regions = _Intervals()
+        new_starts, new_ends = new_regions.starts, new_regions.ends
+
+        # Claims are visited in start order; next_claim is the first that may still reach
+        # the current region. A claim spanning several regions stays current across them.
+        next_claim = 0
+        for reg_start, reg_end in regions:
+            cursor = reg_start  # First line of the region not yet kept or claimed
+            i = next_claim
+            while i < len(claims) and claims[i][0] <= reg_end:
+                claim_start, claim_end = claims[i]
+                if claim_end >= cursor:
+                    if claim_start > cursor:
+                        new_starts.append(cursor)
+                        new_ends.append(claim_start - 1)
+                    cursor = claim_end + 1
+                    if claim_end > reg_end:
+                        break
+                i += 1
+            next_claim = i
+
+            if cursor <= reg_end:
+                new_starts.append(cursor)
+                new_ends.append(reg_end)
+
+        self._total += len(new_regions) - len(regions)
         if new_regions:
             self._regions[file_path] = new_regions
         else:
@@ -220,6 +348,8 @@ class ChangesSet:
 
     def uncovered(self) -> List[ChangeRegion]:
         """Return list of regions not yet claimed by documentation."""
+        if not self._total:
+            return []
         result = []
         for file_path, regions in sorted(self._regions.items()):
             for start, end in regions:
@@ -236,7 +366,7 @@ class ChangesSet:
 
     def __len__(self) -> int:
         """Return total number of uncovered regions."""
-        return sum(len(regions) for regions in self._regions.values())
+        return self._total
 
     def __bool__(self) -> bool:
         """Return True if there are uncovered regions."""
@@ -4,32 +4,73 @@ Tree-sitter based code extraction with comment directive support.
 
 import logging
 import re
+from collections import OrderedDict
 from pathlib import Path
 from typing import Dict, List, Tuple
 
-from tree_sitter import Language, Node, Parser, Query, QueryCursor
+from tree_sitter import Language, Node, Parser
 
-from ..languages.utils import node_text
+from ..languages.utils import marker_comments, parse_cached
 
 logger = logging.getLogger(__name__)
 
+# A //@@start or //@@end marker and its name, matched against a comment's raw bytes
+_MARKER_RE = re.compile(rb"//@@(start|end)\s+([\w-]+)")
+
 
 class BaseExtractor:
     """Base class for language-specific extractors."""
 
+    # Number of recently read files whose contents are kept for reuse
+    FILE_CACHE_SIZE = 16
+
     def __init__(self, language):
         self.language = language
         self.parser = Parser(language)
+        # Resolved path -> ((st_mtime_ns, st_size), contents) of recently read files
+        self._file_cache: "OrderedDict[Path, Tuple[Tuple[int, int], bytes]]" = OrderedDict()
+
+    def _read(self, file_path: Path) -> bytes:
+        """
+        Read a file, reusing its contents while its modification time and size are unchanged.
+
+        Several extractions from one file (functions, structs, macros, markers) then share
+        one read, and through parse_cached one parse.
+        """
+        key = file_path.resolve()
+        stat = key.stat()
+        version = (stat.st_mtime_ns, stat.st_size)
+
+        cached = self._file_cache.get(key)
+        if cached is not None and cached[0] == version:
+            self._file_cache.move_to_end(key)
+            return cached[1]
+
+        source = key.read_bytes()
+        self._file_cache[key] = (version, source)
+        self._file_cache.move_to_end(key)
+        if len(self._file_cache) > self.FILE_CACHE_SIZE:
+            self._file_cache.popitem(last=False)
+        return source
+
+    def invalidate(self, file_path: Path) -> None:
+        """
+        Forget the cached contents of a file, e.g. after an edit within the same mtime tick.
+
+        Args:
+            file_path: Path to the source file
+        """
+        self._file_cache.pop(file_path.resolve(), None)
 
     def parse_file(self, file_path: Path) -> Node:
         """Parse a file and return the root node."""
-        source = file_path.read_bytes()
-        tree = self.parser.parse(source)
+        source = self._read(file_path)
+        tree = parse_cached(self.parser, source)
         return tree.root_node
 
     def parse_bytes(self, source: bytes) -> Node:
-        """Parse source bytes and return the root node."""
-        tree = self.parser.parse(source)
+        """Parse source bytes and return the root node; repeated sources reuse their tree."""
+        tree = parse_cached(self.parser, source)
         return tree.root_node
 
     def extract_lines(self, file_path: Path, start_line: int, end_line: int) -> Tuple[str, int, int]:
@@ -51,7 +92,7 @@ class BaseExtractor:
         """
         Find comment markers within a given node.
 
-        Uses tree-sitter queries with predicates to find //@@start and //@@end markers.
+        Scans the node for //@@start and //@@end marker comments.
 
         Args:
             node: The node to search within (e.g., function body or root)
@@ -59,45 +100,31 @@ class BaseExtractor:
         Returns:
             Dict mapping marker names to (start_line, end_line) tuples
         """
-        # Query for ALL comments first (no predicate)
-        comment_query = Query(self.language, "(comment) @comment")
-        cursor = QueryCursor(comment_query)
-        matches = cursor.matches(node)
-
         markers = {}
         active_markers = {}  # Track open markers
 
-        for _, captures in matches:
-            comments = captures.get("comment", [])
-            for comment in comments:
-                if not comment or not comment.text:
-                    continue
-
-                text = node_text(comment)
-                line_num = comment.start_point.row + 1
-
-                # Check for marker patterns in the comment text
-                # Using Python regex since tree-sitter regex can be tricky
-                if "//@@start" in text:
-                    match = re.search(r"//@@start\s+([\w-]+)", text)
-                    if match:
-                        marker_name = match.group(1)
-                        # Store the line AFTER the comment
-                        active_markers[marker_name] = line_num + 1
-                        logger.debug(f"Found start marker '{marker_name}' at line {line_num}")
-
-                elif "//@@end" in text:
-                    match = re.search(r"//@@end\s+([\w-]+)", text)
-                    if match:
-                        marker_name = match.group(1)
-                        if marker_name in active_markers:
-                            start_line = active_markers.pop(marker_name)
-                            # End at line BEFORE the comment
-                            end_line = line_num - 1
-                            markers[marker_name] = (start_line, end_line)
-                            logger.debug(f"Found end marker '{marker_name}' at line {line_num}")
-                        else:
-                            logger.warning(f"Found //@@end {marker_name} without matching //@@start")
+        # Only comments holding a //@@ marker are visited, found by a bytes scan
+        for comment in marker_comments(node):
+            # One precompiled pattern over the raw bytes tells the kind and the name
+            match = _MARKER_RE.search(comment.text or b"")
+            if not match:
+                continue
+            kind, marker_name = match.group(1), match.group(2).decode("utf8")
+            line_num = comment.start_point.row + 1
+
+            if kind == b"start":
+                # Store the line AFTER the comment
+                active_markers[marker_name] = line_num + 1
+                logger.debug(f"Found start marker '{marker_name}' at line {line_num}")
+
+            elif marker_name in active_markers:
+                start_line = active_markers.pop(marker_name)
+                # End at line BEFORE the comment
+                end_line = line_num - 1
+                markers[marker_name] = (start_line, end_line)
+                logger.debug(f"Found end marker '{marker_name}' at line {line_num}")
+            else:
+                logger.warning(f"Found //@@end {marker_name} without matching //@@start")
 
         # Warn about unclosed markers
         for marker_name in active_markers:
@@ -140,42 +167,12 @@ class MarkerExtractor:
     @staticmethod
     def find_directive_comments(node: Node, language: Language) -> List[Node]:
         """
-        Find comments containing //@@ directives using tree-sitter predicates.
+        Find comments containing //@@ directives.
 
-        CRITICAL: Use double parentheses for predicates!
-        """
-        # Try using #match? predicate - with proper double parens!
-        query_text = """
-        ((comment) @comment 
-          (#match? @comment "//@@"))
+        The comments are located by a bytes scan of the node (see marker_comments), so no
+        query is compiled per call. language is accepted for compatibility; comment nodes
+        are recognized by type in every supported grammar.
         """
-
-        try:
-            query = Query(language, query_text)
-            cursor = QueryCursor(query)
-            matches = cursor.matches(node)
-
-            directive_comments = []
-            for _, captures in matches:
-                comments = captures.get("comment", [])
-                directive_comments.extend(comments)
-
-            logger.debug(f"Found {len(directive_comments)} directive comments using predicate")
-            return directive_comments
-
-        except Exception as e:
-            logger.warning(f"Predicate query failed: {e}, falling back to manual filtering")
-
-            # Fallback: get all comments and filter manually
-            simple_query = Query(language, "(comment) @comment")
-            cursor = QueryCursor(simple_query)
-            matches = cursor.matches(node)
-
-            directive_comments = []
-            for _, captures in matches:
-                comments = captures.get("comment", [])
-                for comment in comments:
-                    if comment and comment.text and "//@@" in node_text(comment):
-                        directive_comments.append(comment)
-
-            return directive_comments
+        directive_comments = list(marker_comments(node))
+        logger.debug(f"Found {len(directive_comments)} directive comments")
+        return directive_comments
@@ -6,22 +6,33 @@ import logging
 from pathlib import Path
 from typing import Dict, Optional, Tuple
 
-import tree_sitter_cpp as tscpp
-from tree_sitter import Language, Node, Query, QueryCursor
+from tree_sitter import Node, Query, QueryCursor
 
 from ..core.extractor import BaseExtractor
-from .cpp_parser import SimpleCppParser
+from .cpp_parser import _CPP_LANGUAGE, SimpleCppParser, _node_to_result
 from .macro_definition_finder import MacroDefinitionFinder
 from .macro_finder_v3 import MacroFinder
+from .utils import slice_lines
 
 logger = logging.getLogger(__name__)
 
+# Classes and namespaces with their names, for find_class_or_namespace
+_CLASS_OR_NAMESPACE_QUERY = Query(
+    _CPP_LANGUAGE,
+    """
+    [
+      (class_specifier name: (type_identifier) @class_name) @class
+      (namespace_definition name: (namespace_identifier) @ns_name) @namespace
+    ]
+    """,
+)
+
 
 class CppExtractor(BaseExtractor):
     """C++ specific extractor with function extraction support."""
 
     def __init__(self):
-        super().__init__(Language(tscpp.language()))
+        super().__init__(_CPP_LANGUAGE)
         self.cpp_parser = SimpleCppParser()
         self.macro_finder = MacroFinder()
         self.macro_def_finder = MacroDefinitionFinder()
@@ -48,7 +59,7 @@ class CppExtractor(BaseExtractor):
         Returns:
             Tuple of (code_text, start_line, end_line)
         """
-        source = file_path.read_bytes()
+        source = self._read(file_path)
 
         # Use the SimpleCppParser to extract function - returns ExtractionResult
         result = self.cpp_parser.extract_function_by_name(source, function_name, signature)
@@ -88,10 +99,9 @@ class CppExtractor(BaseExtractor):
 
             marker_start, marker_end = markers[marker]
 
-            # Extract the marked section from the file
-            lines = file_path.read_text().splitlines()
-            marker_lines = lines[marker_start - 1 : marker_end]
-            marker_text = "\n".join(marker_lines)
+            # The marked lines lie inside the node: slice them out of its bytes rather than
+            # decoding and splitting the whole file
+            marker_text = slice_lines(node.text or b"", node.start_point.row + 1, marker_start, marker_end)
 
             actual_start_line = marker_start
             actual_end_line = marker_end
@@ -126,7 +136,7 @@ class CppExtractor(BaseExtractor):
         When multiple overloads exist (including template vs non-template),
         searches all of them to find the one containing the marker.
         """
-        source = file_path.read_bytes()
+        source = self._read(file_path)
 
         # Find ALL functions with this name (handles template vs non-template, overloads)
         nodes = self.cpp_parser._find_all_nodes_by_qualified_name(source, function_name, ["function_definition"])
@@ -134,25 +144,11 @@ class CppExtractor(BaseExtractor):
         if not nodes:
             raise ValueError(f"Function '{function_name}' not found in {file_path}")
 
-        # Search each overload for the marker
-        from .extraction_result import ExtractionResult
-
+        # Search each overload for the marker; only the overload that has it is decoded
         for node in nodes:
-            text = node.text.decode("utf8") if node.text else ""
-            result = ExtractionResult(
-                text=text,
-                start_line=node.start_point.row + 1,
-                end_line=node.end_point.row + 1,
-                start_column=node.start_point.column,
-                end_column=node.end_point.column,
-                node=node,
-                node_type=node.type,
-                qualified_name=function_name,
-            )
-
-            # Check if this overload has the marker
             markers = self.find_markers_in_node(node)
             if marker in markers:
+                result = _node_to_result(node, function_name)
                 return self._extract_node_marker(file_path, result, marker, f"function '{function_name}'")
 
         # No overload had the marker
@@ -180,7 +176,7 @@ class CppExtractor(BaseExtractor):
         Raises:
             ValueError: If struct/class not found
         """
-        source = file_path.read_bytes()
+        source = self._read(file_path)
 
         # Use the SimpleCppParser to extract struct/class - returns ExtractionResult
         result = self.cpp_parser.extract_struct_or_class_by_name(source, struct_name)
@@ -193,7 +189,7 @@ class CppExtractor(BaseExtractor):
 
     def extract_struct_marker(self, file_path: Path, struct_name: str, marker: str) -> Tuple[str, int, int]:
         """Extract a marked section from within a struct/class/enum/variable declaration."""
-        source = file_path.read_bytes()
+        source = self._read(file_path)
         result = self.cpp_parser.extract_struct_or_class_by_name(source, struct_name)
 
         if not result:
@@ -217,22 +213,14 @@ class CppExtractor(BaseExtractor):
         Raises:
             ValueError: If no match or multiple matches found
         """
-        source = file_path.read_bytes()
+        source = self._read(file_path)
 
         macro_name = macro_spec.get("name")
         if not macro_name:
             raise ValueError("macro spec must include 'name'")
 
-        # Find all instances of the macro
-        results = self.macro_finder.find_by_name(source, macro_name)
-
-        # Filter by any specified arguments
-        for key, value in macro_spec.items():
-            if key.startswith("arg"):
-                position = int(key[3:])
-                results = [
-                    r for r in results if position < len(r["arguments"]) and r["arguments"][position].strip() == value
-                ]
+        # Find the instances of the macro whose arguments match the spec's arg filters
+        results = self.macro_finder.find_by_arguments(source, macro_name, macro_spec)
 
         # Check we have exactly one match
         if not results:
@@ -243,7 +231,7 @@ class CppExtractor(BaseExtractor):
             raise ValueError(
                 f"Multiple {macro_name} instances found ({len(results)} matches). "
                 f"Please be more specific. Found at lines: "
-                f"{', '.join(str(r['line']) for r in results[:5])}"
+                f"{', '.join(str(r.line) for r in results[:5])}"
                 f"{'...' if len(results) > 5 else ''}"
             )
 
@@ -252,13 +240,13 @@ class CppExtractor(BaseExtractor):
 
         # Get the full text directly from the node (result['text'] is truncated)
         # We need to re-extract with full_body=True
-        macro_node_start = result["start_byte"]
-        macro_node_end = result["end_byte"]
+        macro_node_start = result.start_byte
+        macro_node_end = result.end_byte
         full_text = source[macro_node_start:macro_node_end].decode("utf8")
 
-        start_line = result["line"]
-        # Calculate end line from the full text
-        end_line = start_line + full_text.count("\n")
+        start_line = result.line
+        # The node's end row gives the end line without counting newlines in the text
+        end_line = result.end_point[0] + 1
 
         logger.debug(f"Found {macro_name} at lines {start_line}-{end_line}")
         return full_text, start_line, end_line
@@ -275,7 +263,7 @@ class CppExtractor(BaseExtractor):
         Returns:
             Tuple of (code_text, start_line, end_line)
         """
-        source = file_path.read_bytes()
+        source = self._read(file_path)
 
         macro_name = macro_spec.get("name")
         if not macro_name:
@@ -317,7 +305,7 @@ class CppExtractor(BaseExtractor):
         Raises:
             ValueError: If macro definition not found
         """
-        source = file_path.read_bytes()
+        source = self._read(file_path)
 
         # Use the macro definition finder to extract
         text, start_line, end_line = self.macro_def_finder.extract_definition_text(source, macro_name)
@@ -333,37 +321,19 @@ class CppExtractor(BaseExtractor):
             The node representing the class/namespace, or None if not found
         """
         root = self.parse_file(file_path)
-
-        # Query for classes and namespaces
-        query_text = f'''
-        [
-          ((class_specifier
-            name: (type_identifier) @class_name (#eq? @class_name "{name}")
-          ) @class)
-          
-          ((namespace_definition
-            name: (identifier) @ns_name (#eq? @ns_name "{name}")
-          ) @namespace)
-        ]
-        '''
-
-        try:
-            query = Query(self.language, query_text)
-            cursor = QueryCursor(query)
-            matches = cursor.matches(root)
-
-            for _, captures in matches:
-                # Check for class
-                class_nodes = captures.get("class", [])
-                if class_nodes:
-                    return class_nodes[0]
-
-                # Check for namespace
-                ns_nodes = captures.get("namespace", [])
-                if ns_nodes:
-                    return ns_nodes[0]
-
-        except Exception as e:
-            logger.error(f"Query failed: {e}")
+        target = name.encode("utf8")
+
+        # The query is compiled once for the module; names are compared here instead of
+        # through an #eq? predicate baked into a per-name query
+        for _, captures in QueryCursor(_CLASS_OR_NAMESPACE_QUERY).matches(root):
+            # Check for class
+            class_names = captures.get("class_name", [])
+            if class_names and class_names[0].text == target:
+                return captures["class"][0]
+
+            # Check for namespace
+            ns_names = captures.get("ns_name", [])
+            if ns_names and ns_names[0].text == target:
+                return captures["namespace"][0]
 
         return None
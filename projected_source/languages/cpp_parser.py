@@ -4,20 +4,91 @@ Simplified C++ parser using tree-sitter for extracting functions.
 """
 
 import logging
-from typing import List, Optional, Tuple
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Dict, List, NamedTuple, Optional, Tuple
 
 import tree_sitter_cpp as tscpp
-from tree_sitter import Language, Node, Parser
+from tree_sitter import Language, Node, Parser, Query, QueryCursor, Tree
 
 from .extraction_result import ExtractionResult
-from .utils import node_text
+from .utils import node_text, parse_cached
+
+# The one C++ Language of the package: every finder imports it, so their parsers produce
+# equal tree cache keys and share kind ids. Parsers keep the per-instance state.
+_CPP_LANGUAGE = Language(tscpp.language())
+
+
+@lru_cache(maxsize=256)
+def _compiled_query(query_text: str) -> Query:
+    """
+    Compiled C++ query for query_text, shared by every finder.
+
+    Compiling parses the query's S-expression, so each distinct text is compiled once.
+    The cache is keyed by the text alone and holds no finder instances.
+    """
+    return Query(_CPP_LANGUAGE, query_text)
+
+
+def _kind_id(kind: str) -> int:
+    """Grammar symbol id for a named node kind."""
+    kind_id = _CPP_LANGUAGE.id_for_node_kind(kind, True)
+    if kind_id is None:
+        raise ValueError(f"Unknown C++ node kind: {kind}")
+    return kind_id
+
+
+# Node.type allocates a new str on every access, while Node.kind_id is a plain int.
+# Hot dispatch compares kind ids against these instead of comparing type names.
+_FUNCTION_DECLARATOR = _kind_id("function_declarator")
+_FUNCTION_DEFINITION = _kind_id("function_definition")
+_FIELD_DECLARATION = _kind_id("field_declaration")
+_POINTER_DECLARATOR = _kind_id("pointer_declarator")
+_REFERENCE_DECLARATOR = _kind_id("reference_declarator")
+_TEMPLATE_DECLARATION = _kind_id("template_declaration")
+_NAMESPACE_DEFINITION = _kind_id("namespace_definition")
+_DECLARATION = _kind_id("declaration")
+_TYPE_IDENTIFIER = _kind_id("type_identifier")
+_QUALIFIED_IDENTIFIER = _kind_id("qualified_identifier")
+_OPERATOR_NAME = _kind_id("operator_name")
+_SCOPE_IDENTIFIERS = frozenset(_kind_id(kind) for kind in ["namespace_identifier", "identifier"])
+_TEMPLATE_NAMES = frozenset(_kind_id(kind) for kind in ["template_type", "template_function"])
+_TEMPLATE_BASE_NAMES = frozenset(_kind_id(kind) for kind in ["type_identifier", "identifier"])
+_TYPE_SPECIFIERS = frozenset(_kind_id(kind) for kind in ["class_specifier", "struct_specifier", "enum_specifier"])
+
+# Every node that can declare an indexed name. The query engine finds them in C; scopes
+# are then recovered from their ancestors instead of walking the whole tree in Python.
+# Opaque nodes mark regions (function bodies and the like) whose symbols are not indexed.
+_SYMBOL_QUERY = Query(
+    _CPP_LANGUAGE,
+    """
+    [
+      (function_definition)
+      (field_declaration declarator: (function_declarator))
+      (class_specifier)
+      (struct_specifier)
+      (enum_specifier)
+      (declaration)
+    ] @symbol
+    [
+      (compound_statement)
+      (parameter_list)
+      (template_argument_list)
+    ] @opaque
+    """,
+)
+
+# Node types of functions and method declarations, all of which carry a parameter list
+_FUNCTION_NODE_TYPES = frozenset(["function_definition", "field_declaration"])
+
+# Node types matched by extract_struct_or_class_by_name
+_STRUCT_NODE_TYPES = ["class_specifier", "struct_specifier", "enum_specifier", "declaration"]
 
 
 def _node_to_result(node: Node, qualified_name: str) -> ExtractionResult:
     """Helper to create ExtractionResult from a tree-sitter Node."""
-    text = node.text.decode("utf8") if node.text else ""
     return ExtractionResult(
-        text=text,
+        text=node_text(node),
         start_line=node.start_point.row + 1,
         end_line=node.end_point.row + 1,
         start_column=node.start_point.column,
@@ -25,24 +96,199 @@ def _node_to_result(node: Node, qualified_name: str) -> ExtractionResult:
         node=node,
         node_type=node.type,
         qualified_name=qualified_name,
+        start_byte=node.start_byte,
+        end_byte=node.end_byte,
     )
 
 
+def _first_child_of_kind(node: Node, kind: int) -> Optional[Node]:
+    """
+    Find the first direct child of the given kind id.
+
+    Walks the siblings with a TreeCursor and stops at the first match, instead of
+    materializing Node wrappers for every child through Node.children.
+    """
+    cursor = node.walk()
+    if not cursor.goto_first_child():
+        return None
+    while True:
+        child = cursor.node
+        if child is None:
+            return None
+        if child.kind_id == kind:
+            return child
+        if not cursor.goto_next_sibling():
+            return None
+
+
+def _find_function_declarator(node: Node) -> Optional[Node]:
+    """
+    Find the function_declarator of a function definition, method declaration or declarator.
+
+    Descends through template_declaration, pointer_declarator and reference_declarator
+    wrappers. Named fields are followed with child_by_field_name, a single lookup in
+    the bindings; unnamed children are found with a cursor scan.
+    """
+    current: Optional[Node] = node
+    while current is not None:
+        kind = current.kind_id
+        if kind == _FUNCTION_DECLARATOR:
+            return current
+        elif kind == _FUNCTION_DEFINITION or kind == _FIELD_DECLARATION or kind == _POINTER_DECLARATOR:
+            current = current.child_by_field_name("declarator")
+        elif kind == _TEMPLATE_DECLARATION:
+            # The templated function_definition is an unnamed child
+            current = _first_child_of_kind(current, _FUNCTION_DEFINITION)
+        elif kind == _REFERENCE_DECLARATOR:
+            # reference_declarator has function_declarator as unnamed child
+            current = _first_child_of_kind(current, _FUNCTION_DECLARATOR)
+        else:
+            return None
+    return None
+
+
+def _extract_operator_name(op_node: Node) -> bytes:
+    """Extract operator name like b'operator+', b'operator==', b'operator[]'."""
+    parts = []
+    for child in op_node.children:
+        text = child.text
+        if text:
+            parts.append(text)
+    return b"".join(parts)
+
+
+def _extract_template_name(t_node: Node) -> Optional[bytes]:
+    """Extract name from template_type/template_function like b'Container<T>'."""
+    name_node = t_node.child_by_field_name("name")
+    if name_node is None or name_node.kind_id not in _TEMPLATE_BASE_NAMES:
+        return None
+    args_node = t_node.child_by_field_name("arguments")
+    if args_node is None:
+        return name_node.text
+    return (name_node.text or b"") + (args_node.text or b"")
+
+
+def _extract_qualified_parts(qnode: Node) -> List[bytes]:
+    """
+    Extract the parts of a qualified_identifier, outermost first.
+
+    Handles:
+    - Simple identifiers: MyClass::method
+    - Template types: Container<T>::method
+    - Operator names: MyClass::operator+
+    """
+    parts: List[bytes] = []
+    current_node = qnode
+    while current_node and current_node.kind_id == _QUALIFIED_IDENTIFIER:
+        found_nested = False
+        for child in current_node.children:
+            kind = child.kind_id
+            if kind in _SCOPE_IDENTIFIERS:
+                text = child.text
+                if text:
+                    parts.append(text)
+            elif kind in _TEMPLATE_NAMES:
+                # Handle Container<T> in Container<T>::method
+                type_name = _extract_template_name(child)
+                if type_name:
+                    parts.append(type_name)
+            elif kind == _OPERATOR_NAME:
+                parts.append(_extract_operator_name(child))
+            elif kind == _QUALIFIED_IDENTIFIER:
+                # Nested qualified_identifier, continue loop
+                current_node = child
+                found_nested = True
+                break
+        if not found_nested:
+            break
+    return parts
+
+
+def _qualifiers_match(found: Tuple[bytes, ...], target: Tuple[bytes, ...], target_bases: Tuple[bytes, ...]) -> bool:
+    """
+    Check if the found qualifiers end with the target qualifiers.
+
+    Template types match exactly or by base name, so Container<T> matches
+    both Container<T> and Container. Only definitions are compared this way;
+    in-class declarations need their qualifiers to match exactly.
+
+    Args:
+        found: Qualifiers of a candidate symbol
+        target: Requested qualifiers
+        target_bases: target with template args stripped, computed once per lookup
+    """
+    qlen = len(target)
+    if not qlen:
+        return True
+    if len(found) < qlen:
+        return False
+    suffix = found[-qlen:]
+    return suffix == target or all(
+        found_q.split(b"<")[0] == target_base for found_q, target_base in zip(suffix, target_bases)
+    )
+
+
+def _name_may_occur(source_code: bytes, target_name: str, node_types: list) -> bool:
+    """
+    Cheap check whether a qualified name can possibly be declared in source_code.
+
+    Every part of an indexed name is taken verbatim from an identifier in the source,
+    so a part that occurs nowhere in the bytes rules out a match without parsing.
+    Likewise template arguments need a '<' and functions need a parameter list.
+    Qualifiers are not required to appear as "::" since nesting supplies them too.
+    """
+    if "<" in target_name and b"<" not in source_code:
+        return False
+    if b"(" not in source_code and all(t in _FUNCTION_NODE_TYPES for t in node_types):
+        return False
+    for part in target_name.split("::"):
+        base = part.split("<")[0]
+        if base.startswith("operator"):
+            # Operator names are rebuilt without the whitespace the source may contain
+            base = "operator"
+        if base and source_code.find(base.encode("utf8")) == -1:
+            return False
+    return True
+
+
 # Configure logging
 logging.basicConfig(level=logging.WARNING)
 logger = logging.getLogger(__name__)
 
 
+class _Symbol(NamedTuple):
+    """A named declaration recorded by SimpleCppParser._build_symbol_index."""
+
+    name: bytes  # Unqualified name, template arguments included (e.g. b"templateAdd<int>")
+    kind: str  # Type of the declaring node (function_definition, field_declaration, class_specifier, ...)
+    qualifiers: Tuple[bytes, ...]  # Enclosing namespaces/classes, or an out-of-line definition's qualifiers
+    node: Node  # Node to extract (the template_declaration for function templates)
+
+
 class SimpleCppParser:
     """Simple parser for extracting C++ functions using tree-sitter."""
 
+    # Number of recently indexed sources whose symbol indexes are kept for reuse
+    INDEX_CACHE_SIZE = 8
+
     def __init__(self):
-        self.language = Language(tscpp.language())
+        # The grammar is shared by every instance; parser state is per instance
+        self.language = _CPP_LANGUAGE
         self.parser = Parser(self.language)
+        self._index_cache: "OrderedDict[bytes, Dict[bytes, List[_Symbol]]]" = OrderedDict()
+
+    def _parse(self, source_code: bytes) -> Tree:
+        """
+        Parse source code through the shared tree cache (see utils.parse_cached).
+
+        Trees are shared with the macro and query-based finders, so a file one of them
+        has already parsed is not parsed again.
+        """
+        return parse_cached(self.parser, source_code)
 
     def _find_node_by_qualified_name(self, source_code: bytes, target_name: str, node_types: list) -> Optional[Node]:
         """
-        Generic traversal to find a node by qualified name.
+        Find the first node, in document order, matching a qualified name.
 
         Args:
             source_code: The C++ source code as bytes
@@ -52,341 +298,13 @@ class SimpleCppParser:
         Returns:
             The matching tree-sitter node or None if not found
         """
-        tree = self.parser.parse(source_code)
-        root = tree.root_node
-
-        # Parse the target name - could be "name" or "Class::name" or "ns::Class::name"
-        parts = target_name.split("::")
-        target_leaf_name = parts[-1]
-        qualifiers = parts[:-1] if len(parts) > 1 else []
-
-        logger.info(f"Searching for: {target_name}")
-        logger.info(f"  Target name: {target_leaf_name}")
-        logger.info(f"  Qualifiers: {qualifiers}")
-        logger.info(f"  Looking for node types: {node_types}")
-
-        # Walk the tree to find the target node
-        def find_node(node, context_stack=None, depth=0):
-            if context_stack is None:
-                context_stack = []
-
-            indent = "  " * depth
-            logger.debug(f"{indent}Node type: {node.type}, Context: {context_stack}")
-
-            # Check for namespace definitions
-            if node.type == "namespace_definition":
-                # Get namespace name using the field name
-                name_node = node.child_by_field_name("name")
-                namespace_name = None
-                if name_node:
-                    # The name field could be different node types
-                    namespace_name = node_text(name_node)
-                    # Remove trailing :: if present
-                    if namespace_name.endswith("::"):
-                        namespace_name = namespace_name.rstrip(":")
-
-                logger.debug(f"{indent}Found namespace: {namespace_name}")
-
-                # Recurse into namespace body with updated context
-                if namespace_name and "::" in namespace_name:
-                    # Split nested namespace into parts
-                    new_context = context_stack + namespace_name.split("::")
-                else:
-                    new_context = context_stack + ([namespace_name] if namespace_name else [])
-
-                # Get the body field directly
-                body = node.child_by_field_name("body")
-                if body and body.type == "declaration_list":
-                    for decl in body.children:
-                        result = find_node(decl, new_context, depth + 1)
-                        if result:
-                            return result
-
-            # Check for class, struct, or enum definitions
-            elif node.type in ["class_specifier", "struct_specifier", "enum_specifier"]:
-                # Get the class/struct/enum name
-                class_name = None
-                for child in node.children:
-                    if child.type == "type_identifier":
-                        class_name = node_text(child)
-                        break
-
-                logger.debug(f"{indent}Found {node.type}: {class_name}")
-
-                # Check if this is the struct/class we're looking for
-                if node.type in node_types and class_name == target_leaf_name:
-                    # Check if qualifiers match
-                    if not qualifiers:
-                        logger.info(f"{indent}  MATCH FOUND (no qualifiers required)")
-                        return node
-                    elif context_stack == qualifiers:
-                        logger.info(f"{indent}  MATCH FOUND (exact qualifier match)")
-                        return node
-                    elif len(context_stack) >= len(qualifiers):
-                        if context_stack[-len(qualifiers) :] == qualifiers:
-                            logger.info(f"{indent}  MATCH FOUND (suffix qualifier match)")
-                            return node
-
-                # Recurse into the class/struct body with updated context
-                if class_name:
-                    new_context = context_stack + [class_name]
-                    for child in node.children:
-                        if child.type == "field_declaration_list":
-                            logger.debug(f"{indent}  Searching field_declaration_list...")
-                            for member in child.children:
-                                logger.debug(f"{indent}    Member type: {member.type}")
-                                result = find_node(member, new_context, depth + 1)
-                                if result:
-                                    return result
-
-            # Check for variable/constant declarations
-            elif node.type == "declaration" and "declaration" in node_types:
-                # Find the variable name from init_declarator
-                var_name = None
-                for child in node.children:
-                    if child.type == "init_declarator":
-                        # Look for identifier in array_declarator, pointer_declarator, or direct
-                        for subchild in child.children:
-                            if subchild.type == "identifier":
-                                var_name = subchild.text.decode("utf8") if subchild.text else None
-                                break
-                            elif subchild.type in ["array_declarator", "pointer_declarator"]:
-                                for leaf in subchild.children:
-                                    if leaf.type == "identifier":
-                                        var_name = leaf.text.decode("utf8") if leaf.text else None
-                                        break
-                                if var_name:
-                                    break
-                        break
-
-                logger.debug(f"{indent}Found declaration: {var_name}")
-
-                if var_name == target_leaf_name:
-                    if not qualifiers:
-                        logger.info(f"{indent}  MATCH FOUND (no qualifiers required)")
-                        return node
-                    elif context_stack == qualifiers:
-                        logger.info(f"{indent}  MATCH FOUND (exact qualifier match)")
-                        return node
-                    elif len(context_stack) >= len(qualifiers):
-                        if context_stack[-len(qualifiers) :] == qualifiers:
-                            logger.info(f"{indent}  MATCH FOUND (suffix qualifier match)")
-                            return node
-
-            # Check for regular function definitions
-            elif node.type == "function_definition" and "function_definition" in node_types:
-                logger.debug(f"{indent}Found function_definition")
-                # Try to find the function name
-                declarator = node.child_by_field_name("declarator")
-                if declarator:
-                    logger.debug(f"{indent}  Declarator type: {declarator.type}")
-                    found_name = None
-                    found_qualifiers = []
-
-                    def extract_operator_name(op_node):
-                        """Extract operator name like 'operator+', 'operator==', 'operator[]'."""
-                        # operator_name contains 'operator' keyword and the symbol(s)
-                        parts = []
-                        for child in op_node.children:
-                            if child.text:
-                                parts.append(node_text(child))
-                        return "".join(parts)
-
-                    def extract_template_type_name(tt_node):
-                        """Extract name from template_type like 'Container<T>'."""
-                        type_id = None
-                        template_args = None
-                        for child in tt_node.children:
-                            if child.type == "type_identifier":
-                                type_id = node_text(child)
-                            elif child.type == "template_argument_list":
-                                template_args = child.text.decode("utf8")
-                        if type_id and template_args:
-                            return f"{type_id}{template_args}"
-                        return type_id
-
-                    def extract_qualified_parts(qnode):
-                        """Recursively extract parts from qualified_identifier.
-
-                        Handles:
-                        - Simple identifiers: MyClass::method
-                        - Template types: Container<T>::method
-                        - Operator names: MyClass::operator+
-                        """
-                        parts = []
-                        current_node = qnode
-                        while current_node and current_node.type == "qualified_identifier":
-                            found_nested = False
-                            for child in current_node.children:
-                                if child.type in ["namespace_identifier", "identifier"]:
-                                    parts.append(node_text(child))
-                                elif child.type == "template_type":
-                                    # Handle Container<T> in Container<T>::method
-                                    parts.append(extract_template_type_name(child))
-                                elif child.type == "operator_name":
-                                    # Handle MyClass::operator+
-                                    parts.append(extract_operator_name(child))
-                                elif child.type == "qualified_identifier":
-                                    # Nested qualified_identifier, continue loop
-                                    current_node = child
-                                    found_nested = True
-                                    break
-                            if not found_nested:
-                                break
-                        return parts
-
-                    # Navigate through potential wrapper nodes
-                    current = declarator
-                    while current:
-                        logger.debug(f"{indent}  Current node type: {current.type}")
-                        if current.type == "function_declarator":
-                            name_node = current.child_by_field_name("declarator")
-                            if name_node:
-                                logger.debug(f"{indent}    Name node type: {name_node.type}")
-                                if name_node.type == "qualified_identifier":
-                                    all_parts = extract_qualified_parts(name_node)
-                                    if all_parts:
-                                        found_name = all_parts[-1]
-                                        found_qualifiers = all_parts[:-1]
-                                        logger.debug(f"{indent}    Found qualified: {found_qualifiers}::{found_name}")
-                                elif name_node.type == "identifier":
-                                    found_name = node_text(name_node)
-                                    found_qualifiers = context_stack
-                                    logger.debug(f"{indent}    Found id: {found_name} ctx={found_qualifiers}")
-                                elif name_node.type == "field_identifier":
-                                    # Inline class/struct method
-                                    found_name = node_text(name_node)
-                                    found_qualifiers = context_stack
-                                    logger.debug(f"{indent}    Found field_id: {found_name} ctx={found_qualifiers}")
-                                elif name_node.type == "operator_name":
-                                    # Operator overload like operator+
-                                    found_name = extract_operator_name(name_node)
-                                    found_qualifiers = context_stack
-                                    logger.debug(f"{indent}    Found operator: {found_name} ctx={found_qualifiers}")
-                                elif name_node.type == "template_function":
-                                    # Template specialization like templateAdd<int>
-                                    for child in name_node.children:
-                                        if child.type == "identifier":
-                                            base_name = node_text(child)
-                                        elif child.type == "template_argument_list":
-                                            template_args = node_text(child)
-                                    # Store both forms for matching
-                                    found_name = f"{base_name}{template_args}"
-                                    found_qualifiers = context_stack
-                                    logger.debug(f"{indent}    Found template_function: {found_name}")
-                            else:
-                                # Sometimes for inline methods, the name is directly a child
-                                for child in current.children:
-                                    if child.type == "field_identifier":
-                                        found_name = node_text(child)
-                                        found_qualifiers = context_stack
-                                        logger.debug(f"{indent}    field_id: {found_name}")
-                                        break
-                                    elif child.type == "operator_name":
-                                        found_name = extract_operator_name(child)
-                                        found_qualifiers = context_stack
-                                        logger.debug(f"{indent}    operator: {found_name}")
-                                        break
-                            break
-                        elif current.type == "pointer_declarator":
-                            # pointer_declarator has declarator as a named field
-                            current = current.child_by_field_name("declarator")
-                        elif current.type == "reference_declarator":
-                            # reference_declarator has function_declarator as unnamed child
-                            func_decl = None
-                            for child in current.children:
-                                if child.type == "function_declarator":
-                                    func_decl = child
-                                    break
-                            current = func_decl
-                        else:
-                            logger.debug(f"{indent}    Unknown declarator type, stopping")
-                            break
-
-                    # Check if this is the function we're looking for
-                    # For template functions, also match the base name without template args
-                    name_matches = found_name == target_leaf_name
-                    if not name_matches and found_name and "<" in found_name:
-                        # Try matching base name for template functions
-                        base_found = found_name.split("<")[0]
-                        name_matches = base_found == target_leaf_name
-
-                    if name_matches:
-                        logger.info(f"{indent}  Checking: {found_name} vs {target_leaf_name}")
-                        logger.info(f"{indent}  Qualifiers: {found_qualifiers} vs {qualifiers}")
-
-                        def qualifiers_match(found_quals, target_quals):
-                            """Check if qualifier lists match, handling template types.
-
-                            Container<T> matches Container<T> (exact)
-                            Container<T> matches Container (base name)
-                            """
-                            if len(found_quals) != len(target_quals):
-                                return False
-                            for found_q, target_q in zip(found_quals, target_quals):
-                                if found_q == target_q:
-                                    continue
-                                # Try matching base name for templates
-                                found_base = found_q.split("<")[0] if "<" in found_q else found_q
-                                target_base = target_q.split("<")[0] if "<" in target_q else target_q
-                                if found_base != target_base:
-                                    return False
-                            return True
-
-                        # If no qualifiers requested, match any function with this name
-                        if not qualifiers:
-                            logger.info(f"{indent}  MATCH FOUND (no qualifiers required)")
-                            return node
-                        # Otherwise check if qualifiers match (with template handling)
-                        elif qualifiers_match(found_qualifiers, qualifiers):
-                            logger.info(f"{indent}  MATCH FOUND (qualifier match)")
-                            return node
-                        # Also check if the found qualifiers end with our requested qualifiers
-                        elif len(found_qualifiers) >= len(qualifiers):
-                            suffix = found_qualifiers[-len(qualifiers) :]
-                            if qualifiers_match(suffix, qualifiers):
-                                logger.info(f"{indent}  MATCH FOUND (suffix qualifier match)")
-                                return node
-                        logger.info(f"{indent}  No match - qualifiers don't match")
-
-            # Check for field declarations (class method declarations in headers)
-            elif node.type == "field_declaration" and "function_definition" in node_types:
-                # field_declaration can contain a function_declarator for method declarations
-                declarator = node.child_by_field_name("declarator")
-                if declarator and declarator.type == "function_declarator":
-                    found_name, found_qualifiers = self._extract_function_name_and_qualifiers(declarator, context_stack)
-                    if found_name == target_leaf_name:
-                        if not qualifiers:
-                            logger.info(f"{indent}  MATCH FOUND (no qualifiers required)")
-                            return node
-                        elif self._qualifiers_match(found_qualifiers, qualifiers):
-                            logger.info(f"{indent}  MATCH FOUND (qualifier match)")
-                            return node
-
-            # Check for template declarations
-            elif node.type == "template_declaration":
-                logger.debug(f"{indent}Found template_declaration")
-                # Look for function definition inside template
-                for child in node.children:
-                    if child.type == "function_definition":
-                        result = find_node(child, context_stack, depth + 1)
-                        if result:
-                            # Return the whole template declaration
-                            return node
-                    elif child.type in ["class_specifier", "struct_specifier", "enum_specifier"]:
-                        result = find_node(child, context_stack, depth + 1)
-                        if result:
-                            return result
-
-            # Recurse into children
-            for child in node.children:
-                result = find_node(child, context_stack, depth + 1)
-                if result:
-                    return result
-
+        # Lazy %-formatting: lookups are hot and INFO is normally disabled
+        logger.info("Searching for: %s (node types: %s)", target_name, node_types)
+        if not _name_may_occur(source_code, target_name, node_types):
             return None
 
-        return find_node(root)
+        nodes = self._lookup_symbols(self._symbol_index(source_code), target_name, node_types)
+        return nodes[0] if nodes else None
 
     def _find_all_nodes_by_qualified_name(self, source_code: bytes, target_name: str, node_types: list) -> List[Node]:
         """
@@ -400,186 +318,262 @@ class SimpleCppParser:
         Returns:
             List of matching tree-sitter nodes
         """
-        tree = self.parser.parse(source_code)
-        root = tree.root_node
+        if not _name_may_occur(source_code, target_name, node_types):
+            return []
+        return self._lookup_symbols(self._symbol_index(source_code), target_name, node_types)
+
+    def _symbol_index(self, source_code: bytes) -> Dict[bytes, List[_Symbol]]:
+        """Symbol index for source code, built once and reused like the parse tree."""
+        index = self._index_cache.get(source_code)
+        if index is not None:
+            self._index_cache.move_to_end(source_code)
+            return index
+
+        index = self._build_symbol_index(self._parse(source_code).root_node)
+        self._index_cache[source_code] = index
+        if len(self._index_cache) > self.INDEX_CACHE_SIZE:
+            self._index_cache.popitem(last=False)
+        return index
+
+    def _build_symbol_index(self, root: Node) -> Dict[bytes, List[_Symbol]]:
+        """
+        Index every named function, method declaration, class/struct/enum and variable under root.
 
-        parts = target_name.split("::")
-        target_leaf_name = parts[-1]
-        qualifiers = parts[:-1] if len(parts) > 1 else []
+        A single query run answers any number of lookups afterwards. Symbols are keyed by
+        their unqualified name without template arguments and kept in document order.
 
-        results: List[Node] = []
+        Args:
+            root: Root node of a parsed translation unit
 
-        def collect_nodes(node, context_stack=None, depth=0):
-            if context_stack is None:
-                context_stack = []
-
-            # Check for namespace definitions
-            if node.type == "namespace_definition":
-                name_node = node.child_by_field_name("name")
-                namespace_name = None
-                if name_node:
-                    namespace_name = name_node.text.decode("utf8")
-                    if namespace_name.endswith("::"):
-                        namespace_name = namespace_name.rstrip(":")
-
-                if namespace_name and "::" in namespace_name:
-                    new_context = context_stack + namespace_name.split("::")
-                else:
-                    new_context = context_stack + ([namespace_name] if namespace_name else [])
-
-                body = node.child_by_field_name("body")
-                if body and body.type == "declaration_list":
-                    for decl in body.children:
-                        collect_nodes(decl, new_context, depth + 1)
-                # Don't recurse via generic recursion - we already handled body with proper context
-                return
-
-            # Check for class/struct definitions
-            elif node.type in ["class_specifier", "struct_specifier"]:
-                class_name = None
-                for child in node.children:
-                    if child.type == "type_identifier":
-                        class_name = node_text(child)
-                        break
+        Returns:
+            Dict mapping base names to the symbols declared with that name
+        """
+        index: Dict[bytes, List[_Symbol]] = {}
+
+        # Scope (enclosing namespace/class names) that applies to the children of a node,
+        # memoized by node id so each ancestor is resolved once. Scopes are immutable tuples
+        # shared by every symbol declared in them.
+        inner_scopes: Dict[int, Tuple[bytes, ...]] = {root.id: ()}
+
+        def scope_of(parent: Node) -> Tuple[bytes, ...]:
+            chain: List[Node] = []
+            ancestor: Optional[Node] = parent
+            while ancestor is not None and ancestor.id not in inner_scopes:
+                chain.append(ancestor)
+                ancestor = ancestor.parent
+            # Climbing past the top of the tree means nothing encloses the chain
+            scope = inner_scopes[ancestor.id] if ancestor is not None else ()
+            for ancestor in reversed(chain):
+                names = self._scope_names(ancestor)
+                if names:
+                    scope = scope + names
+                inner_scopes[ancestor.id] = scope
+            return scope
+
+        captures = QueryCursor(_SYMBOL_QUERY).captures(root)
+        # Function bodies, parameter lists and template arguments only hold locals (and
+        # lambdas/local classes), which are not extractable by name. Everything captured
+        # inside one is skipped before its scope is resolved.
+        opaque_ids = {n.id for n in captures.get("opaque", [])}
+        captured = captures.get("symbol", []) + captures.get("opaque", [])
+        # A node can match more than once (e.g. a field_declaration with two function
+        # declarators). Keep nodes in document (pre-)order: outer nodes before the
+        # nodes they contain.
+        nodes = sorted({n.id: n for n in captured}.values(), key=lambda n: (n.start_byte, -n.end_byte))
+
+        opaque_end = -1
+        for node in nodes:
+            if node.start_byte < opaque_end:
+                continue
+            if node.id in opaque_ids:
+                opaque_end = node.end_byte
+                continue
+            handler = self._SYMBOL_HANDLERS.get(node.kind_id)
+            if handler is None:
+                continue
+            parent = node.parent
+            if parent is None:
+                # Only the root has no parent, and the root declares nothing itself
+                continue
+            symbol = handler(self, node, parent, scope_of(parent))
+            if symbol is not None:
+                index.setdefault(symbol.name.split(b"<")[0], []).append(symbol)
+
+        logger.debug("Indexed %d symbol names", len(index))
+        return index
+
+    def _type_specifier_symbol(self, node: Node, parent: Node, scope: Tuple[bytes, ...]) -> Optional[_Symbol]:
+        """Symbol for a named class, struct, or enum definition."""
+        class_name = self._class_name(node)
+        return _Symbol(class_name, node.type, scope, node) if class_name else None
+
+    def _declaration_symbol(self, node: Node, parent: Node, scope: Tuple[bytes, ...]) -> Optional[_Symbol]:
+        """Symbol for a variable/constant declaration."""
+        var_name = self._extract_variable_name(node)
+        return _Symbol(var_name, "declaration", scope, node) if var_name else None
+
+    def _function_definition_symbol(self, node: Node, parent: Node, scope: Tuple[bytes, ...]) -> Optional[_Symbol]:
+        """Symbol for a function definition; templates are extracted with their template<...> header."""
+        declarator = node.child_by_field_name("declarator")
+        if not declarator:
+            return None
+        found_name, found_qualifiers = self._extract_function_name_and_qualifiers(declarator, scope)
+        if not found_name:
+            return None
+        result_node = parent if parent.kind_id == _TEMPLATE_DECLARATION else node
+        return _Symbol(found_name, "function_definition", found_qualifiers, result_node)
+
+    def _field_declaration_symbol(self, node: Node, parent: Node, scope: Tuple[bytes, ...]) -> Optional[_Symbol]:
+        """Symbol for a method declaration in a class body (e.g. in headers)."""
+        declarator = node.child_by_field_name("declarator")
+        if not declarator or declarator.kind_id != _FUNCTION_DECLARATOR:
+            return None
+        found_name, found_qualifiers = self._extract_function_name_and_qualifiers(declarator, scope)
+        return _Symbol(found_name, "field_declaration", found_qualifiers, node) if found_name else None
+
+    # Symbol builders by node kind id: one dict probe per captured node instead of an elif
+    # chain. Subclasses can index additional kinds by extending a copy of this table (the
+    # kinds must also be captured by _SYMBOL_QUERY).
+    _SYMBOL_HANDLERS = {
+        **dict.fromkeys(_TYPE_SPECIFIERS, _type_specifier_symbol),
+        _DECLARATION: _declaration_symbol,
+        _FUNCTION_DEFINITION: _function_definition_symbol,
+        _FIELD_DECLARATION: _field_declaration_symbol,
+    }
+
+    def _scope_names(self, node: Node) -> Tuple[bytes, ...]:
+        """Names a namespace or named class/struct/enum adds to the scope of its children."""
+        kind = node.kind_id
+        if kind == _NAMESPACE_DEFINITION:
+            name_node = node.child_by_field_name("name")
+            namespace_name = (name_node.text or b"").rstrip(b":") if name_node else None
+            if namespace_name:
+                # Nested namespace definitions ("a::b") add one scope per part
+                return tuple(namespace_name.split(b"::"))
+        elif kind in _TYPE_SPECIFIERS:
+            class_name = self._class_name(node)
+            if class_name:
+                return (class_name,)
+        return ()
+
+    def _class_name(self, node: Node) -> Optional[bytes]:
+        """
+        Name of a class/struct/enum specifier, or None if it is anonymous.
+
+        Specializations (class Foo<int>) and qualified names (struct ns::Foo) are named
+        by a template_type/qualified_identifier and are not indexed.
+        """
+        name_node = node.child_by_field_name("name")
+        if name_node is not None and name_node.kind_id == _TYPE_IDENTIFIER:
+            return name_node.text
+        return None
+
+    def _lookup_symbols(self, index: Dict[bytes, List[_Symbol]], target_name: str, node_types: list) -> List[Node]:
+        """
+        Find all indexed nodes matching a qualified name.
+
+        Args:
+            index: Symbol index from _build_symbol_index
+            target_name: Qualified name to search for (e.g., "MyClass", "ns::MyClass::method")
+            node_types: List of node types to match; "function_definition" also matches
+                method declarations (field_declaration)
 
-                if class_name:
-                    new_context = context_stack + [class_name]
-                    for child in node.children:
-                        if child.type == "field_declaration_list":
-                            for member in child.children:
-                                collect_nodes(member, new_context, depth + 1)
-                # Don't recurse into class children via generic recursion -
-                # we already handled members with proper class context above
-                return
-
-            # Check for function definitions
-            elif node.type == "function_definition" and "function_definition" in node_types:
-                declarator = node.child_by_field_name("declarator")
-                if declarator:
-                    found_name, found_qualifiers = self._extract_function_name_and_qualifiers(declarator, context_stack)
-
-                    if found_name == target_leaf_name:
-                        if self._qualifiers_match(found_qualifiers, qualifiers):
-                            results.append(node)
-
-            # Check for field declarations (class method declarations in headers)
-            elif node.type == "field_declaration" and "function_definition" in node_types:
-                # field_declaration can contain a function_declarator for method declarations
-                declarator = node.child_by_field_name("declarator")
-                if declarator and declarator.type == "function_declarator":
-                    found_name, found_qualifiers = self._extract_function_name_and_qualifiers(declarator, context_stack)
-
-                    if found_name == target_leaf_name:
-                        if self._qualifiers_match(found_qualifiers, qualifiers):
-                            results.append(node)
-
-            # Check for template declarations
-            elif node.type == "template_declaration":
-                for child in node.children:
-                    if child.type == "function_definition":
-                        declarator = child.child_by_field_name("declarator")
-                        if declarator:
-                            found_name, found_qualifiers = self._extract_function_name_and_qualifiers(
-                                declarator, context_stack
-                            )
-                            # Match base name for template functions
-                            base_found = found_name.split("<")[0] if "<" in found_name else found_name
-                            if base_found == target_leaf_name or found_name == target_leaf_name:
-                                if self._qualifiers_match(found_qualifiers, qualifiers):
-                                    results.append(node)
-                # Don't recurse into template children - we already handled the function
-                return
-
-            # Recurse into children
-            for child in node.children:
-                collect_nodes(child, context_stack, depth + 1)
-
-        collect_nodes(root)
+        Returns:
+            List of matching tree-sitter nodes in document order
+        """
+        # The index holds raw source bytes; encode the target once instead of decoding
+        # every candidate name. Everything derived from the target is computed once.
+        parts = target_name.encode("utf8").split(b"::")
+        target_leaf_name = parts[-1]
+        target_base_name = target_leaf_name.split(b"<")[0]
+        qualifiers = tuple(parts[:-1])
+        qualifier_bases = tuple(q.split(b"<")[0] for q in qualifiers)
+
+        kinds = set(node_types)
+        if "function_definition" in kinds:
+            kinds.add("field_declaration")
+
+        results: List[Node] = []
+        # Candidates share the target's base name, so a target without template args matches
+        # any of them by base name; one with template args ("templateAdd<int>") must match exactly
+        for symbol in index.get(target_base_name, []):
+            if symbol.kind not in kinds:
+                continue
+            if target_base_name != target_leaf_name and symbol.name != target_leaf_name:
+                continue
+            if symbol.kind == "field_declaration":
+                # An in-class declaration is qualified by the bare class name, so template
+                # bases would let it shadow the out-of-line Container<T>::method definition
+                if qualifiers and symbol.qualifiers[-len(qualifiers) :] != qualifiers:
+                    continue
+            elif not _qualifiers_match(symbol.qualifiers, qualifiers, qualifier_bases):
+                continue
+            results.append(symbol.node)
         return results
 
+    def _extract_variable_name(self, node: Node) -> Optional[bytes]:
+        """Extract the variable name from a declaration's first init_declarator."""
+        for child in node.children:
+            if child.type == "init_declarator":
+                # Look for identifier in array_declarator, pointer_declarator, or direct
+                for subchild in child.children:
+                    if subchild.type == "identifier":
+                        return subchild.text or None
+                    elif subchild.type in ["array_declarator", "pointer_declarator"]:
+                        for leaf in subchild.children:
+                            if leaf.type == "identifier":
+                                return leaf.text or None
+                return None
+        return None
+
     def _extract_function_name_and_qualifiers(
-        self, declarator: Node, context_stack: List[str]
-    ) -> Tuple[str, List[str]]:
-        """Extract function name and qualifiers from a declarator node."""
-        found_name = ""
-        found_qualifiers = []
-
-        def extract_operator_name(op_node):
-            parts = []
-            for child in op_node.children:
-                if child.text:
-                    parts.append(node_text(child))
-            return "".join(parts)
-
-        def extract_qualified_parts(qnode):
-            parts = []
-            current_node = qnode
-            while current_node and current_node.type == "qualified_identifier":
-                found_nested = False
-                for child in current_node.children:
-                    if child.type in ["namespace_identifier", "identifier"]:
-                        parts.append(node_text(child))
-                    elif child.type == "template_type":
-                        type_id = None
-                        for tc in child.children:
-                            if tc.type == "type_identifier":
-                                type_id = tc.text.decode("utf8")
-                        if type_id:
-                            parts.append(type_id)
-                    elif child.type == "operator_name":
-                        parts.append(extract_operator_name(child))
-                    elif child.type == "qualified_identifier":
-                        current_node = child
-                        found_nested = True
-                        break
-                if not found_nested:
-                    break
-            return parts
-
-        current = declarator
-        while current:
-            if current.type == "function_declarator":
-                name_node = current.child_by_field_name("declarator")
-                if name_node:
-                    if name_node.type == "qualified_identifier":
-                        all_parts = extract_qualified_parts(name_node)
-                        if all_parts:
-                            found_name = all_parts[-1]
-                            found_qualifiers = all_parts[:-1]
-                    elif name_node.type == "identifier":
-                        found_name = node_text(name_node)
-                        found_qualifiers = context_stack
-                    elif name_node.type == "field_identifier":
-                        found_name = node_text(name_node)
+        self, declarator: Node, context_stack: Tuple[bytes, ...]
+    ) -> Tuple[bytes, Tuple[bytes, ...]]:
+        """
+        Extract function name and qualifiers from a declarator node.
+
+        Out-of-line definitions ("Class::method") carry their own qualifiers; everything
+        else is qualified by the enclosing namespaces/classes in context_stack. Template
+        arguments are kept in the name (b"templateAdd<int>", b"Container<T>"). Names are
+        the raw source bytes, left undecoded.
+        """
+        found_name = b""
+        found_qualifiers: Tuple[bytes, ...] = ()
+
+        current = _find_function_declarator(declarator)
+        if current:
+            name_node = current.child_by_field_name("declarator")
+            if name_node:
+                name_type = name_node.type
+                if name_type == "qualified_identifier":
+                    all_parts = _extract_qualified_parts(name_node)
+                    if all_parts:
+                        found_name = all_parts[-1]
+                        found_qualifiers = tuple(all_parts[:-1])
+                elif name_type in ["identifier", "field_identifier"]:
+                    found_name = name_node.text or b""
+                    found_qualifiers = context_stack
+                elif name_type == "operator_name":
+                    found_name = _extract_operator_name(name_node)
+                    found_qualifiers = context_stack
+                elif name_type == "template_function":
+                    # Template specialization like templateAdd<int>
+                    found_name = _extract_template_name(name_node) or b""
+                    found_qualifiers = context_stack
+            else:
+                # Sometimes for inline methods, the name is directly a child
+                for child in current.children:
+                    if child.type == "field_identifier":
+                        found_name = child.text or b""
                         found_qualifiers = context_stack
-                    elif name_node.type == "operator_name":
-                        found_name = extract_operator_name(name_node)
+                        break
+                    elif child.type == "operator_name":
+                        found_name = _extract_operator_name(child)
                         found_qualifiers = context_stack
-                break
-            elif current.type == "pointer_declarator":
-                current = current.child_by_field_name("declarator")
-            elif current.type == "reference_declarator":
-                func_decl = None
-                for child in current.children:
-                    if child.type == "function_declarator":
-                        func_decl = child
                         break
-                current = func_decl
-            else:
-                break
 
         return found_name, found_qualifiers
 
-    def _qualifiers_match(self, found: List[str], target: List[str]) -> bool:
-        """Check if qualifier lists match."""
-        if not target:
-            return True
-        if found == target:
-            return True
-        if len(found) >= len(target) and found[-len(target) :] == target:
-            return True
-        return False
-
     def _extract_parameter_signature(self, node: Node) -> str:
         """
         Extract parameter types from a function definition or field_declaration node.
@@ -587,47 +581,8 @@ class SimpleCppParser:
         Returns a string like "int, std::string const&, TMProposeSet"
         containing the parameter types (without names).
         """
-        # Handle template_declaration by descending to inner function_definition
-        target_node = node
-        if node.type == "template_declaration":
-            for child in node.children:
-                if child.type == "function_definition":
-                    target_node = child
-                    break
-
-        # Handle field_declaration (class method declarations in headers)
-        # These don't have a "declarator" field - function_declarator is a direct child
-        if target_node.type == "field_declaration":
-            for child in target_node.children:
-                if child.type == "function_declarator":
-                    params_node = child.child_by_field_name("parameters")
-                    if params_node:
-                        return node_text(params_node)
-            return ""
-
-        declarator = target_node.child_by_field_name("declarator")
-        if not declarator:
-            return ""
-
-        # Navigate to function_declarator
-        current = declarator
-        while current and current.type != "function_declarator":
-            if current.type == "pointer_declarator":
-                current = current.child_by_field_name("declarator")
-            elif current.type == "reference_declarator":
-                for child in current.children:
-                    if child.type == "function_declarator":
-                        current = child
-                        break
-                else:
-                    break
-            else:
-                break
-
-        if not current or current.type != "function_declarator":
-            return ""
-
-        params_node = current.child_by_field_name("parameters")
+        func_decl = _find_function_declarator(node)
+        params_node = func_decl.child_by_field_name("parameters") if func_decl else None
         if not params_node:
             return ""
 
@@ -654,36 +609,141 @@ class SimpleCppParser:
         Returns:
             ExtractionResult with all the info, or None if not found
         """
+        node = self._find_function_node(source_code, function_name, signature)
+        return _node_to_result(node, function_name) if node else None
+
+    def extract_function_range(
+        self, source_code: bytes, function_name: str, signature: str = None
+    ) -> Optional[Tuple[int, int]]:
+        """
+        Locate a function like extract_function_by_name without decoding its text.
+
+        Args:
+            source_code: The C++ source code as bytes
+            function_name: Name of the function to locate (can include :: for class/namespace)
+            signature: Optional string to match against parameter types for overload disambiguation
+
+        Returns:
+            (start_byte, end_byte) of the function in source_code, or None if not found
+            (slice memoryview(source_code) with it for a zero-copy view of the code)
+        """
+        node = self._find_function_node(source_code, function_name, signature)
+        return (node.start_byte, node.end_byte) if node else None
+
+    def _find_function_node(self, source_code: bytes, function_name: str, signature: Optional[str]) -> Optional[Node]:
+        """Find the node for a function, disambiguating overloads by signature if given."""
         if signature is None:
             # Original behavior - find first match
-            node = self._find_node_by_qualified_name(source_code, function_name, ["function_definition"])
-            return _node_to_result(node, function_name) if node else None
+            return self._find_node_by_qualified_name(source_code, function_name, ["function_definition"])
 
         # Find all overloads and filter by signature
         nodes = self._find_all_nodes_by_qualified_name(source_code, function_name, ["function_definition"])
+        return self._select_overload(source_code, nodes, function_name, signature)
+
+    def extract_many(
+        self, source_code: bytes, names: List[Tuple[str, Optional[str]]], kind: str = "function"
+    ) -> List[Optional[ExtractionResult]]:
+        """
+        Extract several functions, or several structs/classes, from the same C++ source code.
+
+        The source is parsed and indexed once up front and every name is resolved
+        against that index.
+
+        Args:
+            source_code: The C++ source code as bytes
+            names: (name, signature) pairs; signature may be None, as in extract_function_by_name
+            kind: "function" to match as extract_function_by_name, or "struct" to match as
+                extract_struct_or_class_by_name (signatures must then be None)
+
+        Returns:
+            One ExtractionResult (or None if not found) per requested name, in order
+
+        Raises:
+            ValueError: If kind is unknown, or a struct lookup is given a signature
+        """
+        if kind == "function":
+            node_types = ["function_definition"]
+        elif kind == "struct":
+            node_types = _STRUCT_NODE_TYPES
+            if any(signature is not None for _, signature in names):
+                raise ValueError("Signatures only apply to function lookups")
+        else:
+            raise ValueError(f"Unknown extraction kind '{kind}' (expected 'function' or 'struct')")
+
+        index = self._symbol_index(source_code)
+
+        results: List[Optional[ExtractionResult]] = []
+        for name, signature in names:
+            nodes = self._lookup_symbols(index, name, node_types)
+            if signature is None:
+                node = nodes[0] if nodes else None
+            else:
+                node = self._select_overload(source_code, nodes, name, signature)
+            results.append(_node_to_result(node, name) if node else None)
+        return results
+
+    def _select_overload(
+        self, source_code: bytes, nodes: List[Node], function_name: str, signature: str
+    ) -> Optional[Node]:
+        """
+        Pick the first overload whose parameter list contains signature.
+
+        Args:
+            source_code: The C++ source code the nodes were parsed from
+            nodes: Candidate overloads in document order
+            function_name: Requested name, for diagnostics
+            signature: String to match against parameter types
 
+        Returns:
+            The first matching node, or None if no overload matches
+        """
         if not nodes:
             return None
 
-        # Filter by signature
-        matching = []
-        for node in nodes:
-            param_sig = self._extract_parameter_signature(node)
-            if signature in param_sig:
-                matching.append(node)
-
-        if not matching:
+        # Parameter text is needed for filtering and again for the diagnostics below;
+        # decode each parameter span only once
+        param_sigs: Dict[Tuple[int, int], str] = {}
+
+        def param_sig_of(node: Node) -> str:
+            key = (node.start_byte, node.end_byte)
+            if key not in param_sigs:
+                param_sigs[key] = self._extract_parameter_signature(node)
+            return param_sigs[key]
+
+        # Filter by signature. The parameter list lies within the node, so a signature
+        # that doesn't occur anywhere in the node's bytes can be rejected without
+        # descending into the declarator.
+        sig_bytes = signature.encode("utf8")
+
+        def matches_signature(node: Node) -> bool:
+            if source_code.find(sig_bytes, node.start_byte, node.end_byte) == -1:
+                return False
+            # Match against the raw parameter-list bytes; text is only decoded for diagnostics
+            func_decl = _find_function_declarator(node)
+            params_node = func_decl.child_by_field_name("parameters") if func_decl else None
+            if not params_node:
+                return False
+            return source_code.find(sig_bytes, params_node.start_byte, params_node.end_byte) != -1
+
+        remaining = iter(nodes)
+        match = next((n for n in remaining if matches_signature(n)), None)
+
+        if match is None:
             # No match - provide helpful error info
-            available = [self._extract_parameter_signature(n) for n in nodes]
-            logger.warning(f"No overload of '{function_name}' matches signature '{signature}'. Available: {available}")
+            if logger.isEnabledFor(logging.WARNING):
+                available = [param_sig_of(n) for n in nodes]
+                logger.warning(
+                    f"No overload of '{function_name}' matches signature '{signature}'. Available: {available}"
+                )
             return None
 
-        if len(matching) > 1:
+        # Only scan the rest of the overloads when the ambiguity warning can be emitted
+        if logger.isEnabledFor(logging.WARNING) and any(matches_signature(n) for n in remaining):
             # Multiple matches - need more specific signature
-            sigs = [self._extract_parameter_signature(n) for n in matching]
+            sigs = [param_sig_of(n) for n in nodes if matches_signature(n)]
             logger.warning(f"Multiple overloads of '{function_name}' match signature '{signature}': {sigs}")
 
-        return _node_to_result(matching[0], function_name)
+        return match
 
     def extract_struct_or_class_by_name(self, source_code: bytes, name: str) -> Optional[ExtractionResult]:
         """
@@ -702,220 +762,20 @@ class SimpleCppParser:
         Returns:
             ExtractionResult with all the info, or None if not found
         """
-        node = self._find_node_by_qualified_name(
-            source_code, name, ["class_specifier", "struct_specifier", "enum_specifier", "declaration"]
-        )
+        node = self._find_node_by_qualified_name(source_code, name, _STRUCT_NODE_TYPES)
         return _node_to_result(node, name) if node else None
 
+    def extract_struct_or_class_range(self, source_code: bytes, name: str) -> Optional[Tuple[int, int]]:
+        """
+        Locate a struct, class, enum, or variable declaration without decoding its text.
 
-if __name__ == "__main__":
-    import sys
-
-    # Enable debug logging if --debug flag is passed
-    if "--debug" in sys.argv:
-        logger.setLevel(logging.DEBUG)
-        # Also set root logger to see tree-sitter debug info
-        logging.getLogger().setLevel(logging.DEBUG)
-    elif "--info" in sys.argv:
-        logger.setLevel(logging.INFO)
-
-    # Test the parser
-    parser = SimpleCppParser()
-
-    test_code = b"""
-    inline std::optional<std::vector<uint8_t>>
-    FromJSIntArrayOrHexString(JSContext* ctx, JSValueConst v, int max_len)
-    {
-        return {};
-    }
-    
-    static JSValue js_process_binary(JSContext *ctx, JSValueConst this_val,
-                                     int argc, JSValueConst *argv) 
-    {
-        return JS_UNDEFINED;
-    }
-    
-    class MyClass {
-    public:
-        void myMethod() {
-            // Do something
-        }
-        
-        int calculate(int x, int y) {
-            return x + y;
-        }
-    };
-    
-    struct MyStruct {
-        void structMethod() {
-            // Struct method
-        }
-    };
-    
-    // Out-of-line definition
-    void MyClass::anotherMethod() {
-        // Out-of-line implementation
-    }
-    
-    namespace utils {
-        void helperFunction() {
-            // Namespace function
-        }
-        
-        class Helper {
-        public:
-            void process() {
-                // Method in namespace class
-            }
-        };
-        
-        struct Data {
-            void validate() {
-                // Struct method in namespace
-            }
-        };
-    }
-    
-    // Out-of-line namespace class method
-    void utils::Helper::cleanup() {
-        // Out-of-line namespace class method
-    }
-    
-    namespace outer {
-        namespace inner {
-            void deepFunction() {
-                // Nested namespace function
-            }
-        }
-    }
-    
-    // Nested struct/class cases
-    struct OuterStruct {
-        struct InnerStruct {
-            void nestedMethod() {
-                // Method in struct in struct
-            }
-        };
-        
-        class InnerClass {
-        public:
-            void anotherNested() {
-                // Method in class in struct
-            }
-        };
-    };
-    
-    class OuterClass {
-    public:
-        struct InnerStruct {
-            void methodInStructInClass() {
-                // Method in struct in class
-            }
-        };
-    };
-    
-    // Out-of-line nested struct method
-    void OuterStruct::InnerStruct::outOfLineNested() {
-        // Out-of-line nested struct method
-    }
-    """
+        Args:
+            source_code: The C++ source code as bytes
+            name: Name of the struct/class/enum/variable to locate (can include :: for namespace/nesting)
 
-    # Test regular functions
-    result = parser.extract_function_by_name(test_code, "FromJSIntArrayOrHexString")
-    if result:
-        print("Found FromJSIntArrayOrHexString:")
-        print(result)
-        print()
-
-    # Test class methods
-    result = parser.extract_function_by_name(test_code, "MyClass::calculate")
-    if result:
-        print("Found MyClass::calculate:")
-        print(result)
-        print()
-    else:
-        print("NOT FOUND: MyClass::calculate")
-
-    # Test struct methods
-    result = parser.extract_function_by_name(test_code, "MyStruct::structMethod")
-    if result:
-        print("Found MyStruct::structMethod:")
-        print(result)
-        print()
-
-    # Test out-of-line definitions
-    result = parser.extract_function_by_name(test_code, "MyClass::anotherMethod")
-    if result:
-        print("Found MyClass::anotherMethod (out-of-line):")
-        print(result)
-        print()
-
-    # Test namespace functions
-    result = parser.extract_function_by_name(test_code, "utils::helperFunction")
-    if result:
-        print("Found utils::helperFunction:")
-        print(result)
-        print()
-
-    # Test namespace class methods
-    result = parser.extract_function_by_name(test_code, "utils::Helper::process")
-    if result:
-        print("Found utils::Helper::process:")
-        print(result)
-        print()
-
-    # Test namespace struct methods
-    result = parser.extract_function_by_name(test_code, "utils::Data::validate")
-    if result:
-        print("Found utils::Data::validate:")
-        print(result)
-        print()
-
-    # Test out-of-line namespace class method
-    result = parser.extract_function_by_name(test_code, "utils::Helper::cleanup")
-    if result:
-        print("Found utils::Helper::cleanup (out-of-line):")
-        print(result)
-        print()
-
-    # Test nested namespace function
-    result = parser.extract_function_by_name(test_code, "outer::inner::deepFunction")
-    if result:
-        print("Found outer::inner::deepFunction:")
-        print(result)
-        print()
-
-    # Test nested struct methods
-    print("\n--- Testing nested struct/class methods ---")
-
-    result = parser.extract_function_by_name(test_code, "OuterStruct::InnerStruct::nestedMethod")
-    if result:
-        print("Found OuterStruct::InnerStruct::nestedMethod:")
-        print(result)
-        print()
-    else:
-        print("NOT FOUND: OuterStruct::InnerStruct::nestedMethod\n")
-
-    result = parser.extract_function_by_name(test_code, "OuterStruct::InnerClass::anotherNested")
-    if result:
-        print("Found OuterStruct::InnerClass::anotherNested:")
-        print(result)
-        print()
-    else:
-        print("NOT FOUND: OuterStruct::InnerClass::anotherNested\n")
-
-    result = parser.extract_function_by_name(test_code, "OuterClass::InnerStruct::methodInStructInClass")
-    if result:
-        print("Found OuterClass::InnerStruct::methodInStructInClass:")
-        print(result)
-        print()
-    else:
-        print("NOT FOUND: OuterClass::InnerStruct::methodInStructInClass\n")
-
-    result = parser.extract_function_by_name(test_code, "OuterStruct::InnerStruct::outOfLineNested")
-    if result:
-        print("Found OuterStruct::InnerStruct::outOfLineNested (out-of-line):")
-        print(result)
-        print()
-    else:
-        print("NOT FOUND: OuterStruct::InnerStruct::outOfLineNested\n")
+        Returns:
+            (start_byte, end_byte) of the declaration in source_code, or None if not found
+            (slice memoryview(source_code) with it for a zero-copy view of the code)
+        """
+        node = self._find_node_by_qualified_name(source_code, name, _STRUCT_NODE_TYPES)
+        return (node.start_byte, node.end_byte) if node else None
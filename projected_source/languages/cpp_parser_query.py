@@ -4,273 +4,405 @@ C++ parser using tree-sitter queries - much cleaner approach.
 """
 
 import logging
-from typing import Optional
+from bisect import bisect_left
+from string import Template
+from typing import Dict, List, Optional, Tuple
 
-import tree_sitter_cpp as tscpp
-from tree_sitter import Language, Parser, Query, QueryCursor
+from tree_sitter import Node, Parser, QueryCursor, Tree
 
+from .cpp_parser import _CPP_LANGUAGE, _compiled_query, _kind_id, _node_to_result
 from .extraction_result import ExtractionResult
-from .utils import node_text
+from .utils import parse_cached, reparse_cached
 
 logger = logging.getLogger(__name__)
 
+# Parameterless queries for unqualified lookups: one compiled query serves every name,
+# which is compared against the @name capture in Python.
+_ALL_TYPES_QUERY = """
+[
+  (struct_specifier name: (type_identifier) @name) @result
+  (class_specifier name: (type_identifier) @name) @result
+]
+"""
+
+_ALL_FUNCTIONS_QUERY = """
+(function_definition
+  declarator: [
+    (function_declarator declarator: (identifier) @name)
+    (pointer_declarator declarator: (function_declarator declarator: (identifier) @name))
+  ]
+) @result
+"""
+
+# Qualified lookups that the parameterless queries cannot serve. They are templates so the
+# pattern text is written once; $-placeholders take the qualifiers and the target name.
+_NESTED_TYPE_QUERY = Template(
+    """
+(namespace_definition
+  name: (namespace_identifier) @ns (#eq? @ns "$ns")
+  body: (declaration_list
+    [(class_specifier
+      name: (type_identifier) @outer (#eq? @outer "$outer")
+      body: (field_declaration_list
+        [(struct_specifier
+          name: (type_identifier) @name (#eq? @name "$name")
+        ) @result
+
+        (class_specifier
+          name: (type_identifier) @name (#eq? @name "$name")
+        ) @result]
+      )
+    )
+
+    (struct_specifier
+      name: (type_identifier) @outer (#eq? @outer "$outer")
+      body: (field_declaration_list
+        [(struct_specifier
+          name: (type_identifier) @name (#eq? @name "$name")
+        ) @result
+
+        (class_specifier
+          name: (type_identifier) @name (#eq? @name "$name")
+        ) @result]
+      )
+    )]
+  )
+)
+"""
+)
+
+_SCOPED_FUNCTION_QUERY = Template(
+    """
+[
+  ; Namespace function
+  (namespace_definition
+    name: (namespace_identifier) @ns (#eq? @ns "$scope")
+    body: (declaration_list
+      (function_definition
+        declarator: (function_declarator
+          declarator: (identifier) @name (#eq? @name "$name")
+        )
+      ) @result
+    )
+  )
+
+  ; Class method (inline definition)
+  (class_specifier
+    name: (type_identifier) @class (#eq? @class "$scope")
+    body: (field_declaration_list
+      (function_definition
+        declarator: (function_declarator
+          declarator: (field_identifier) @name (#eq? @name "$name")
+        )
+      ) @result
+    )
+  )
+
+  ; Out-of-line class method definition
+  (function_definition
+    declarator: (function_declarator
+      declarator: (qualified_identifier
+        scope: (namespace_identifier) @class (#eq? @class "$scope")
+        name: (identifier) @name (#eq? @name "$name")
+      )
+    )
+  ) @result
+]
+"""
+)
+
+# Kind ids of the nodes an unqualified type lookup can return, and of their names
+_TYPE_KINDS = frozenset(_kind_id(kind) for kind in ["struct_specifier", "class_specifier"])
+_TYPE_IDENTIFIER = _kind_id("type_identifier")
+
+# Body node type -> node types that own such a body, for checking a type's enclosing scope
+_SCOPE_OWNERS = {
+    "declaration_list": ("namespace_definition",),
+    "field_declaration_list": ("class_specifier", "struct_specifier"),
+}
+
+# Node type of the name field of each scope owner
+_SCOPE_NAME_TYPES = {
+    "namespace_definition": "namespace_identifier",
+    "class_specifier": "type_identifier",
+    "struct_specifier": "type_identifier",
+}
+
+
+def _directly_in_scope(node: Node, scope: bytes) -> bool:
+    """
+    Check that node sits directly in the body of the namespace, class or struct named scope.
+
+    Args:
+        node: Candidate type node
+        scope: Name of the enclosing scope, as bytes
+
+    Returns:
+        True if node's parent is the body of a matching scope
+    """
+    body = node.parent
+    if body is None or body.type not in _SCOPE_OWNERS:
+        return False
+    owner = body.parent
+    if owner is None or owner.type not in _SCOPE_OWNERS[body.type]:
+        return False
+    scope_name = owner.child_by_field_name("name")
+    return (
+        scope_name is not None
+        and scope_name.type == _SCOPE_NAME_TYPES[owner.type]
+        and scope_name.text == scope
+        and owner.child_by_field_name("body") == body
+    )
+
+
+def _walk_find_type(root: Node, source_code: bytes, target: bytes) -> Optional[Node]:
+    """
+    Find the first struct or class named target, in document order, with a TreeCursor walk.
+
+    Subtrees whose byte range holds no occurrence of target cannot contain the type's name
+    and are skipped without visiting their children.
+
+    Args:
+        root: Root node to search
+        source_code: Source bytes the tree was parsed from
+        target: Type name as bytes
+
+    Returns:
+        The struct_specifier or class_specifier node, or None
+    """
+    # Start offsets of every occurrence of target, in increasing order
+    hits = []
+    pos = source_code.find(target)
+    while pos != -1:
+        hits.append(pos)
+        pos = source_code.find(target, pos + 1)
+    if not hits:
+        return None
+
+    cursor = root.walk()
+    while True:
+        node = cursor.node
+        if node is None:
+            return None
+        # First occurrence at or after the node's start; the node can hold the name only
+        # if that occurrence ends within it
+        i = bisect_left(hits, node.start_byte)
+        if i < len(hits) and hits[i] + len(target) <= node.end_byte:
+            if node.kind_id in _TYPE_KINDS:
+                name_node = node.child_by_field_name("name")
+                if name_node is not None and name_node.kind_id == _TYPE_IDENTIFIER and name_node.text == target:
+                    return node
+            if cursor.goto_first_child():
+                continue
+        while not cursor.goto_next_sibling():
+            if not cursor.goto_parent():
+                return None
+
 
 class QueryBasedCppParser:
     """C++ parser using tree-sitter queries for cleaner extraction."""
 
     def __init__(self):
-        self.language = Language(tscpp.language())
+        self.language = _CPP_LANGUAGE
         self.parser = Parser(self.language)
 
+    def reparse(self, old_source: bytes, new_source: bytes, **edit) -> Tree:
+        """
+        Incrementally parse an edited source so later lookups on it skip a full parse.
+
+        Args:
+            old_source: Source bytes before the edit (parsed earlier by any finder)
+            new_source: Source bytes after the edit
+            **edit: Tree.edit keyword arguments describing the change
+
+        Returns:
+            The parse tree for new_source
+        """
+        return reparse_cached(self.parser, old_source, new_source, **edit)
+
     def extract_struct_or_class_by_name(self, source_code: bytes, name: str) -> Optional[ExtractionResult]:
         """
         Extract a struct or class using tree-sitter queries.
 
         This is much cleaner than manual traversal!
         """
-        tree = self.parser.parse(source_code)
-        root = tree.root_node
-
         # Parse the qualified name
         parts = name.split("::")
         target_name = parts[-1]
         qualifiers = parts[:-1] if len(parts) > 1 else []
 
+        # A name that occurs nowhere in the source cannot match; skip the parse and query
+        if target_name.encode("utf8") not in source_code:
+            return None
+
+        tree = parse_cached(self.parser, source_code)
+        root = tree.root_node
+
         # Build query based on whether we have qualifiers
+        name_filter = None
+        scope_filter = None
         if not qualifiers:
-            # Simple case - just find by name
-            query_text = f'''
-            [
-              (struct_specifier
-                name: (type_identifier) @name (#eq? @name "{target_name}")
-              ) @result
-              
-              (class_specifier
-                name: (type_identifier) @name (#eq? @name "{target_name}")
-              ) @result
-            ]
-            '''
+            # Simple case - a direct walk stops at the first hit without query overhead
+            node = _walk_find_type(root, source_code, target_name.encode("utf8"))
+            return _node_to_result(node, name) if node else None
         elif len(qualifiers) == 1:
-            # One level of nesting (namespace or class)
-            query_text = f'''
-            [
-              ; Namespace case
-              (namespace_definition
-                name: (namespace_identifier) @ns (#eq? @ns "{qualifiers[0]}")
-                body: (declaration_list
-                  (struct_specifier
-                    name: (type_identifier) @name (#eq? @name "{target_name}")
-                  ) @result
-                )
-              )
-              
-              (namespace_definition
-                name: (namespace_identifier) @ns (#eq? @ns "{qualifiers[0]}")
-                body: (declaration_list
-                  (class_specifier
-                    name: (type_identifier) @name (#eq? @name "{target_name}")
-                  ) @result
-                )
-              )
-              
-              ; Nested in class case
-              (class_specifier
-                name: (type_identifier) @outer (#eq? @outer "{qualifiers[0]}")
-                body: (field_declaration_list
-                  (access_specifier)?
-                  (struct_specifier
-                    name: (type_identifier) @name (#eq? @name "{target_name}")
-                  ) @result
-                )
-              )
-              
-              (class_specifier
-                name: (type_identifier) @outer (#eq? @outer "{qualifiers[0]}")
-                body: (field_declaration_list
-                  (access_specifier)?
-                  (class_specifier
-                    name: (type_identifier) @name (#eq? @name "{target_name}")
-                  ) @result
-                )
-              )
-              
-              ; Nested in struct case
-              (struct_specifier
-                name: (type_identifier) @outer (#eq? @outer "{qualifiers[0]}")
-                body: (field_declaration_list
-                  (struct_specifier
-                    name: (type_identifier) @name (#eq? @name "{target_name}")
-                  ) @result
-                )
-              )
-              
-              (struct_specifier
-                name: (type_identifier) @outer (#eq? @outer "{qualifiers[0]}")
-                body: (field_declaration_list
-                  (class_specifier
-                    name: (type_identifier) @name (#eq? @name "{target_name}")
-                  ) @result
-                )
-              )
-            ]
-            '''
+            # One level of nesting (namespace or class): the parameterless query finds the
+            # name and its enclosing scope is checked in Python, rather than compiling six
+            # alternative patterns per qualified name
+            query_text = _ALL_TYPES_QUERY
+            name_filter = target_name.encode("utf8")
+            scope_filter = qualifiers[0].encode("utf8")
         else:
             # Multiple levels - build a nested query
             # For now, handle the common case of namespace::class::inner
             if len(qualifiers) == 2:
-                query_text = f'''
-                (namespace_definition
-                  name: (namespace_identifier) @ns (#eq? @ns "{qualifiers[0]}")
-                  body: (declaration_list
-                    [(class_specifier
-                      name: (type_identifier) @outer (#eq? @outer "{qualifiers[1]}")
-                      body: (field_declaration_list
-                        [(struct_specifier
-                          name: (type_identifier) @name (#eq? @name "{target_name}")
-                        ) @result
-                        
-                        (class_specifier
-                          name: (type_identifier) @name (#eq? @name "{target_name}")
-                        ) @result]
-                      )
-                    )
-                    
-                    (struct_specifier
-                      name: (type_identifier) @outer (#eq? @outer "{qualifiers[1]}")
-                      body: (field_declaration_list
-                        [(struct_specifier
-                          name: (type_identifier) @name (#eq? @name "{target_name}")
-                        ) @result
-                        
-                        (class_specifier
-                          name: (type_identifier) @name (#eq? @name "{target_name}")
-                        ) @result]
-                      )
-                    )]
-                  )
-                )
-                '''
+                query_text = _NESTED_TYPE_QUERY.substitute(ns=qualifiers[0], outer=qualifiers[1], name=target_name)
             else:
                 # For deeper nesting, fall back to manual search for now
                 logger.warning(f"Deep nesting ({len(qualifiers)} levels) not fully supported yet")
                 return None
 
-        try:
-            query = Query(self.language, query_text)
-            cursor = QueryCursor(query)
-            matches = cursor.matches(root)
-
-            for _, captures in matches:
-                if "result" in captures:
-                    node = captures["result"][0]
-                    return ExtractionResult(
-                        text=node_text(node),
-                        start_line=node.start_point.row + 1,
-                        end_line=node.end_point.row + 1,
-                        start_column=node.start_point.column,
-                        end_column=node.end_point.column,
-                        node=node,
-                        node_type=node.type,
-                        qualified_name=name,
-                    )
-        except Exception as e:
-            logger.error(f"Query failed: {e}")
-            logger.debug(f"Query text was: {query_text}")
-
-        return None
+        return self._first_result(root, query_text, name, name_filter, scope_filter)
 
     def extract_function_by_name(self, source_code: bytes, name: str) -> Optional[ExtractionResult]:
         """
         Extract a function using tree-sitter queries.
         """
-        tree = self.parser.parse(source_code)
-        root = tree.root_node
-
         # Parse the qualified name
         parts = name.split("::")
         target_name = parts[-1]
         qualifiers = parts[:-1] if len(parts) > 1 else []
 
+        # A name that occurs nowhere in the source cannot match; skip the parse and query
+        if target_name.encode("utf8") not in source_code:
+            return None
+
+        tree = parse_cached(self.parser, source_code)
+        root = tree.root_node
+
+        name_filter = None
         if not qualifiers:
             # Simple function
-            query_text = f'''
-            (function_definition
-              declarator: [
-                (function_declarator
-                  declarator: (identifier) @name (#eq? @name "{target_name}")
-                )
-                (pointer_declarator
-                  declarator: (function_declarator
-                    declarator: (identifier) @name (#eq? @name "{target_name}")
-                  )
-                )
-              ]
-            ) @result
-            '''
+            query_text = _ALL_FUNCTIONS_QUERY
+            name_filter = target_name.encode("utf8")
         elif len(qualifiers) == 1:
             # Could be namespace::function or Class::method
-            query_text = f'''
-            [
-              ; Namespace function
-              (namespace_definition
-                name: (namespace_identifier) @ns (#eq? @ns "{qualifiers[0]}")
-                body: (declaration_list
-                  (function_definition
-                    declarator: (function_declarator
-                      declarator: (identifier) @name (#eq? @name "{target_name}")
-                    )
-                  ) @result
-                )
-              )
-              
-              ; Class method (inline definition)
-              (class_specifier
-                name: (type_identifier) @class (#eq? @class "{qualifiers[0]}")
-                body: (field_declaration_list
-                  (function_definition
-                    declarator: (function_declarator
-                      declarator: (field_identifier) @name (#eq? @name "{target_name}")
-                    )
-                  ) @result
-                )
-              )
-              
-              ; Out-of-line class method definition
-              (function_definition
-                declarator: (function_declarator
-                  declarator: (qualified_identifier
-                    scope: (namespace_identifier) @class (#eq? @class "{qualifiers[0]}")
-                    name: (identifier) @name (#eq? @name "{target_name}")
-                  )
-                )
-              ) @result
-            ]
-            '''
+            query_text = _SCOPED_FUNCTION_QUERY.substitute(scope=qualifiers[0], name=target_name)
         else:
             # Handle nested cases
             logger.warning("Multi-level function qualifiers not fully implemented yet")
             return None
 
+        return self._first_result(root, query_text, name, name_filter)
+
+    def extract_many(
+        self, source_code: bytes, names: List[str], kind: str = "function"
+    ) -> List[Optional[ExtractionResult]]:
+        """
+        Extract several functions, or several structs/classes, from the same C++ source code.
+
+        Unqualified names (and struct names with one qualifier) are all resolved in a single
+        run of the shared parameterless query over one parse tree; other names fall back to
+        the single-name lookup, which reuses the same cached tree.
+
+        Args:
+            source_code: The C++ source code as bytes
+            names: Names to extract, qualified as for the single-name methods
+            kind: "function" to match as extract_function_by_name, or "struct" to match as
+                extract_struct_or_class_by_name
+
+        Returns:
+            One ExtractionResult (or None if not found) per requested name, in order
+
+        Raises:
+            ValueError: If kind is unknown
+        """
+        if kind == "function":
+            query_text = _ALL_FUNCTIONS_QUERY
+            extract_one = self.extract_function_by_name
+        elif kind == "struct":
+            query_text = _ALL_TYPES_QUERY
+            extract_one = self.extract_struct_or_class_by_name
+        else:
+            raise ValueError(f"Unknown extraction kind '{kind}' (expected 'function' or 'struct')")
+
+        results: List[Optional[ExtractionResult]] = [None] * len(names)
+
+        # Name bytes -> (position in names, required scope) of each request the query serves
+        wanted: Dict[bytes, List[Tuple[int, Optional[bytes]]]] = {}
+        for i, name in enumerate(names):
+            parts = name.split("::")
+            if len(parts) == 1 or (kind == "struct" and len(parts) == 2):
+                scope = parts[0].encode("utf8") if len(parts) == 2 else None
+                wanted.setdefault(parts[-1].encode("utf8"), []).append((i, scope))
+            else:
+                results[i] = extract_one(source_code, name)
+
+        if not wanted:
+            return results
+
+        tree = parse_cached(self.parser, source_code)
+        cursor = QueryCursor(_compiled_query(query_text))
+        for _, captures in cursor.matches(tree.root_node):
+            if "result" not in captures:
+                continue
+            requests = wanted.get(captures["name"][0].text or b"")
+            if not requests:
+                continue
+            node = captures["result"][0]
+            for i, scope in requests:
+                # Matches arrive in document order, so the first hit per request wins
+                if results[i] is None and (scope is None or _directly_in_scope(node, scope)):
+                    results[i] = _node_to_result(node, names[i])
+
+        return results
+
+    def _first_result(
+        self,
+        root: Node,
+        query_text: str,
+        name: str,
+        name_filter: Optional[bytes],
+        scope_filter: Optional[bytes] = None,
+    ) -> Optional[ExtractionResult]:
+        """
+        Run a lookup query and build a result from its first match in document order.
+
+        Args:
+            root: Root node to search
+            query_text: Query capturing the match as @result and its name as @name
+            name: Requested qualified name, recorded on the result
+            name_filter: Name the @name capture must equal, for parameterless queries
+            scope_filter: Name of the namespace, class or struct whose body must directly
+                hold the @result node
+
+        Returns:
+            ExtractionResult for the first match, or None
+        """
         try:
-            query = Query(self.language, query_text)
-            cursor = QueryCursor(query)
-            matches = cursor.matches(root)
-
-            for _, captures in matches:
-                if "result" in captures:
-                    node = captures["result"][0]
-                    return ExtractionResult(
-                        text=node_text(node),
-                        start_line=node.start_point.row + 1,
-                        end_line=node.end_point.row + 1,
-                        start_column=node.start_point.column,
-                        end_column=node.end_point.column,
-                        node=node,
-                        node_type=node.type,
-                        qualified_name=name,
-                    )
+            cursor = QueryCursor(_compiled_query(query_text))
+            if name_filter is None:
+                # #eq? predicates already did the filtering: take the first @result capture
+                # without building a per-match capture dict
+                result_nodes = cursor.captures(root).get("result")
+                node = result_nodes[0] if result_nodes else None
+            else:
+                # Stop at the first hit instead of looking at the remaining matches
+                node = next(
+                    (
+                        captures["result"][0]
+                        for _, captures in cursor.matches(root)
+                        if "result" in captures
+                        and captures["name"][0].text == name_filter
+                        and (scope_filter is None or _directly_in_scope(captures["result"][0], scope_filter))
+                    ),
+                    None,
+                )
         except Exception as e:
             logger.error(f"Query failed: {e}")
             logger.debug(f"Query text was: {query_text}")
+            return None
 
-        return None
+        if node is None:
+            return None
+        return _node_to_result(node, name)
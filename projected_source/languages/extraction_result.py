@@ -18,6 +18,8 @@ class ExtractionResult:
     node: Optional[Any] = None  # tree-sitter Node
     node_type: Optional[str] = None
     qualified_name: Optional[str] = None
+    start_byte: int = 0  # Byte offsets into the source the text was taken from
+    end_byte: int = 0
 
     @property
     def line_count(self) -> int:
@@ -7,18 +7,55 @@ This module finds the actual #define statements themselves.
 """
 
 import logging
-from typing import List, Optional, Tuple, TypedDict
+import re
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from itertools import repeat
+from typing import List, NamedTuple, Optional, Tuple
 
-import tree_sitter_cpp as tscpp
-from tree_sitter import Language, Node, Parser, Query, QueryCursor
+from tree_sitter import Node, Parser, Query, QueryCursor, Tree
 
-from .utils import node_text
+from .cpp_parser import _CPP_LANGUAGE, _compiled_query
+from .utils import node_text, parse_cached, reparse_cached
 
 logger = logging.getLogger(__name__)
 
+# All macro definitions with their names; lookups by name filter the matches in Python
+# so a single compiled query serves every macro name. Names and parameter lists come back
+# as captures, so results are built without a field lookup per macro.
+_DEFINITIONS_QUERY = """
+[
+  (preproc_def name: (identifier) @name) @macro
+  (preproc_function_def name: (identifier) @name parameters: (preproc_params) @params) @macro
+]
+"""
+
+_PREFIXED_DEFINITIONS_QUERY = """
+[
+  (preproc_def name: (identifier) @name (#match? @name "{pattern}")) @macro
+  (preproc_function_def
+    name: (identifier) @name (#match? @name "{pattern}")
+    parameters: (preproc_params) @params) @macro
+]
+"""
+
+
+@lru_cache(maxsize=256)
+def _prefixed_query(prefix: str) -> Query:
+    """Compiled definitions query for a name prefix; its text is only built on a miss."""
+    pattern = "^" + re.escape(prefix)
+    # Backslashes and quotes must be escaped again inside the query string literal
+    literal = pattern.replace("\\", "\\\\").replace('"', '\\"')
+    return Query(_CPP_LANGUAGE, _PREFIXED_DEFINITIONS_QUERY.format(pattern=literal))
 
-class MacroDefinition(TypedDict):
-    """Type definition for macro definition results."""
+
+class MacroDefinition(NamedTuple):
+    """
+    A macro definition result.
+
+    A NamedTuple rather than a dict: headers can define thousands of macros, and a
+    tuple is a fraction of a dict's size.
+    """
 
     name: str
     type: str  # 'object' or 'function'
@@ -38,9 +75,23 @@ class MacroDefinitionFinder:
     """
 
     def __init__(self):
-        self.language = Language(tscpp.language())
+        self.language = _CPP_LANGUAGE
         self.parser = Parser(self.language)
 
+    def reparse(self, old_source: bytes, new_source: bytes, **edit) -> Tree:
+        """
+        Incrementally parse an edited source so later lookups on it skip a full parse.
+
+        Args:
+            old_source: Source bytes before the edit (parsed earlier by any finder)
+            new_source: Source bytes after the edit
+            **edit: Tree.edit keyword arguments describing the change
+
+        Returns:
+            The parse tree for new_source
+        """
+        return reparse_cached(self.parser, old_source, new_source, **edit)
+
     def find_definition(self, source: bytes, macro_name: str) -> Optional[MacroDefinition]:
         """
         Find a specific macro definition by name.
@@ -52,85 +103,114 @@ class MacroDefinitionFinder:
         Returns:
             MacroDefinition if found, None otherwise
         """
-        tree = self.parser.parse(source)
-
-        # Query for specific macro definition
-        query_text = f'''
-        [
-          (preproc_def
-            name: (identifier) @name (#eq? @name "{macro_name}")
-          ) @macro
-          
-          (preproc_function_def
-            name: (identifier) @name (#eq? @name "{macro_name}")
-          ) @macro
-        ]
-        '''
-
-        query = Query(self.language, query_text)
+        target = macro_name.encode("utf8")
+        # A defined name appears verbatim in the source; without it there is nothing to parse for
+        if target not in source:
+            return None
+
+        tree = parse_cached(self.parser, source)
+
+        # One parameterless query serves every name; names are compared as bytes
+        query = _compiled_query(_DEFINITIONS_QUERY)
         cursor = QueryCursor(query)
         matches = cursor.matches(tree.root_node)
 
         for pattern_index, captures in matches:
             macro_nodes = captures.get("macro", [])
-            if macro_nodes:
-                return self._build_result(macro_nodes[0])
+            name_nodes = captures.get("name", [])
+            if macro_nodes and name_nodes and name_nodes[0].text == target:
+                params_nodes = captures.get("params")
+                return self._build_result(macro_nodes[0], name_nodes[0], params_nodes[0] if params_nodes else None)
 
         return None
 
-    def find_all_definitions(self, source: bytes, prefix: str = None) -> List[MacroDefinition]:
+    def find_all_definitions(
+        self, source: bytes, prefix: str = None, byte_range: Optional[Tuple[int, int]] = None
+    ) -> List[MacroDefinition]:
         """
         Find all macro definitions, optionally filtered by prefix.
 
         Args:
             source: Source code bytes
             prefix: Optional prefix to filter by (e.g. "DEFINE_")
+            byte_range: Optional (start_byte, end_byte) span; only definitions overlapping it
+                are found, and the query never visits the rest of the tree
 
         Returns:
             List of MacroDefinition objects
         """
-        tree = self.parser.parse(source)
-
-        # Query for all macro definitions
-        query_text = """
-        [
-          (preproc_def) @macro
-          (preproc_function_def) @macro
-        ]
-        """
+        if prefix and prefix.encode("utf8") not in source:
+            return []
+
+        tree = parse_cached(self.parser, source)
 
-        query = Query(self.language, query_text)
+        # Query for all macro definitions; a prefix is matched by the query itself so
+        # macros that don't match never reach _build_result
+        query = _prefixed_query(prefix) if prefix else _compiled_query(_DEFINITIONS_QUERY)
         cursor = QueryCursor(query)
+        if byte_range is not None:
+            cursor.set_byte_range(*byte_range)
         matches = cursor.matches(tree.root_node)
 
         results = []
         for pattern_index, captures in matches:
-            macro_nodes = captures.get("macro", [])
-            for node in macro_nodes:
-                result = self._build_result(node)
-                if result:
-                    # Filter by prefix if specified
-                    if prefix and not result["name"].startswith(prefix):
-                        continue
-                    results.append(result)
+            macro_nodes = captures.get("macro")
+            if not macro_nodes:
+                continue
+            name_nodes = captures.get("name")
+            params_nodes = captures.get("params")
+            result = self._build_result(
+                macro_nodes[0], name_nodes[0] if name_nodes else None, params_nodes[0] if params_nodes else None
+            )
+            if result:
+                results.append(result)
 
         return results
 
-    def _build_result(self, node: Node) -> Optional[MacroDefinition]:
+    def find_all_definitions_many(
+        self, sources: List[bytes], prefix: str = None, max_workers: Optional[int] = None
+    ) -> List[List[MacroDefinition]]:
+        """
+        Find all macro definitions in many sources, spread over worker processes.
+
+        Building results is pure Python, so threads would serialize on the GIL. Each
+        worker process creates its own finder once and handles a share of the sources.
+
+        Args:
+            sources: Source code bytes of each file
+            prefix: Optional prefix to filter by (e.g. "DEFINE_")
+            max_workers: Number of worker processes (default: one per CPU); 1 runs in-process
+
+        Returns:
+            One list of MacroDefinition objects per source, in order
+        """
+        if len(sources) < 2 or max_workers == 1:
+            return [self.find_all_definitions(source, prefix) for source in sources]
+
+        with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker) as pool:
+            return list(pool.map(_find_all_in_worker, sources, repeat(prefix)))
+
+    def _build_result(
+        self, node: Node, name_node: Optional[Node] = None, params_node: Optional[Node] = None
+    ) -> Optional[MacroDefinition]:
         """
         Build a MacroDefinition from a tree-sitter node.
 
         Args:
             node: A preproc_def or preproc_function_def node
+            name_node: The macro's name node, if already captured by the query
+            params_node: A function-like macro's parameter list, if already captured
 
         Returns:
             MacroDefinition object
         """
-        # Get the full text including backslash continuations
-        full_text = node_text(node)
+        # Get the full text including backslash continuations; it is measured as bytes
+        # and decoded once
+        raw = node.text or b""
 
         # Get the macro name
-        name_node = node.child_by_field_name("name")
+        if name_node is None:
+            name_node = node.child_by_field_name("name")
         if not name_node:
             return None
         name = node_text(name_node)
@@ -139,19 +219,21 @@ class MacroDefinitionFinder:
         is_function = node.type == "preproc_function_def"
         parameters = None
         if is_function:
-            params_node = node.child_by_field_name("parameters")
+            if params_node is None:
+                params_node = node.child_by_field_name("parameters")
             if params_node:
                 parameters = node_text(params_node)
 
-        # Count lines and check for multi-line
-        lines = full_text.count("\n") + 1
-        is_multiline = "\\" in full_text and lines > 1
+        # Count lines from the node's rows (each row ends at a newline in its text) and
+        # check for multi-line
+        lines = node.end_point.row - node.start_point.row + 1
+        is_multiline = lines > 1 and b"\\" in raw
 
         return MacroDefinition(
             name=name,
             type="function" if is_function else "object",
             parameters=parameters,
-            text=full_text,
+            text=raw.decode("utf8"),
             lines=lines,
             multiline=is_multiline,
             start_byte=node.start_byte,
@@ -178,7 +260,23 @@ class MacroDefinitionFinder:
         if not result:
             raise ValueError(f"Macro definition '{macro_name}' not found")
 
-        return result["text"], result["start_line"], result["end_line"]
+        return result.text, result.start_line, result.end_line
+
+
+# Finder owned by each find_all_definitions_many worker process
+_worker_finder: Optional[MacroDefinitionFinder] = None
+
+
+def _init_worker():
+    """Create the worker process's finder once, before it handles any source."""
+    global _worker_finder
+    _worker_finder = MacroDefinitionFinder()
+
+
+def _find_all_in_worker(source: bytes, prefix: Optional[str]) -> List[MacroDefinition]:
+    """Run find_all_definitions with the worker process's finder."""
+    assert _worker_finder is not None, "worker finder not initialized"
+    return _worker_finder.find_all_definitions(source, prefix)
 
 
 # Demo/test
@@ -205,11 +303,11 @@ if __name__ == "__main__":
     # Find specific macro
     result = finder.find_definition(test_code, "MULTI_LINE_MACRO")
     if result:
-        print(f"Found {result['name']}:")
-        print(f"  Type: {result['type']}")
-        print(f"  Lines: {result['start_line']}-{result['end_line']}")
-        print(f"  Text:\n{result['text']}")
+        print(f"Found {result.name}:")
+        print(f"  Type: {result.type}")
+        print(f"  Lines: {result.start_line}-{result.end_line}")
+        print(f"  Text:\n{result.text}")
 
     print("\nAll macros:")
     for macro in finder.find_all_definitions(test_code):
-        print(f"  {macro['name']} ({macro['type']}) - {macro['lines']} lines")
+        print(f"  {macro.name} ({macro.type}) - {macro.lines} lines")
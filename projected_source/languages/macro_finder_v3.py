@@ -1,48 +1,204 @@
 #!/usr/bin/env python3
 """
 Library for finding and extracting C/C++ macros using tree-sitter.
-Version 3: Ultra-DRY implementation with TypedDict and modern patterns.
+Version 3: Ultra-DRY implementation with slotted dataclasses and modern patterns.
 """
 
+import hashlib
 import logging
-from enum import Enum
-from functools import lru_cache
-from typing import Any, Callable, Dict, List, Optional, Tuple, TypedDict
+import re
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from functools import partial
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Set, Tuple
 
-import tree_sitter_cpp as tscpp
 from tree_sitter import Language, Node, Parser, Query, QueryCursor
 
-from .utils import node_text
+from .cpp_parser import _CPP_LANGUAGE
+from .utils import iter_nodes, marker_comments, node_text, parse_cached, release_trees
 
 logger = logging.getLogger(__name__)
 
+# Every macro usage or macro-style definition. Names are filtered in Python, so this one
+# compiled query serves every lookup instead of one compiled query per name or pattern.
+_MACRO_QUERY = Query(
+    _CPP_LANGUAGE,
+    """
+[
+  (call_expression
+    function: (identifier) @macro_name
+    arguments: (argument_list) @args
+  ) @macro_usage
+
+  (function_definition
+    declarator: (function_declarator
+      declarator: (identifier) @macro_name
+      parameters: (parameter_list) @args
+    )
+  ) @macro_usage
+]
+""",
+)
+
+# Number of macro bodies whose marker rows find_markers_in_node keeps for reuse
+MARKER_CACHE_SIZE = 1024
+
+# Digest of a node's bytes -> marker name -> (start, end) rows relative to the node's first row.
+# Relative rows make one entry serve every macro with the same body, wherever it sits.
+_marker_rows_cache: "OrderedDict[bytes, Dict[str, Tuple[int, int]]]" = OrderedDict()
+
 # Type definitions
 Point = Tuple[int, int]  # (row, column)
 
 
-class MacroResult(TypedDict):
-    """Type definition for macro search results."""
+@dataclass(slots=True)
+class MacroResult:
+    """
+    A macro search result.
+
+    A slotted dataclass rather than a dict: large files yield thousands of results, and a
+    slotted instance has no per-instance hash table. Fields can still be read by key
+    (result["line"]) for code written against the earlier dict form.
+
+    text and arguments are decoded from the nodes on first access, so results that are
+    only located (line, type, macro) never pay for them.
+    """
 
     macro: str
-    arguments: List[str]
-    text: str
     start_byte: int
     end_byte: int
     start_point: Point
     end_point: Point
     line: int
     type: Optional[str]  # 'call' or 'definition'
-    node: Optional[Node]  # The actual tree-sitter node
+    node: Node  # The actual tree-sitter node
     args_node: Optional[Node]  # The arguments node
+    _arguments: Optional[List[str]] = field(default=None, repr=False, compare=False)
+    _text: Optional[str] = field(default=None, repr=False, compare=False)
+
+    @property
+    def arguments(self) -> List[str]:
+        """Argument texts (parameter names for definitions)."""
+        if self._arguments is None:
+            self._arguments = _extract_arguments(self.args_node)
+        return self._arguments
+
+    @property
+    def text(self) -> str:
+        """Macro text; definitions are cut before their body."""
+        if self._text is None:
+            self._text = _extract_text(self.node, full_body=False)
+        return self._text
+
+    def __getitem__(self, key: str) -> Any:
+        """Read a field by name, as with the earlier dict form."""
+        if key.startswith("_"):
+            raise KeyError(key)
+        try:
+            return getattr(self, key)
+        except AttributeError:
+            raise KeyError(key) from None
+
+
+class _SpanText(NamedTuple):
+    """Text of nodes within one decoded parent, sliced instead of decoded node by node."""
+
+    raw: bytes  # Parent's source bytes
+    ascii_text: Optional[str]  # Parent's decoded text, if pure ASCII so byte offsets index it
+    base: int  # Parent's start byte
+
+    def of(self, node: Node) -> str:
+        """Text of a node lying within the parent."""
+        start, end = node.start_byte - self.base, node.end_byte - self.base
+        if self.ascii_text is not None:
+            return self.ascii_text[start:end]
+        return self.raw[start:end].decode("utf8")
+
+
+def _extract_text(node: Node, full_body: bool = False) -> str:
+    """Extract text from node with optional body truncation."""
+    raw = node.text or b""
+
+    if not full_body and node.type == "function_definition":
+        # Truncate at first brace for function definitions, decoding only the head
+        brace_pos = raw.find(b"{")
+        if brace_pos > 0:
+            return raw[:brace_pos].decode("utf8").strip()
+
+    return raw.decode("utf8")
+
+
+# Punctuation children of a parameter_list that carry no parameter text
+_PARAMETER_PUNCTUATION = frozenset(("(", ")", ","))
+
+
+def _extract_params(args_node: Node, span: _SpanText) -> List[str]:
+    """Extract parameter names from a function definition's parameter_list."""
+    args: List[str] = []
+    append = args.append
+    for child in args_node.children:
+        child_type = child.type
+        if child_type == "parameter_declaration":
+            # Extract parameter name (last identifier)
+            tokens = span.of(child).split()
+            if tokens:
+                append(tokens[-1])
+        elif child_type not in _PARAMETER_PUNCTUATION:
+            append(span.of(child).strip())
+    return args
+
+
+def _extract_args(args_node: Node, span: _SpanText) -> List[str]:
+    """Extract argument texts from a call's argument_list."""
+    args: List[str] = []
+    current_arg: List[str] = []
+    for child in args_node.children:
+        child_type = child.type
+        if child_type == "(":
+            continue
+        elif child_type == ",":
+            if current_arg:
+                args.append("".join(current_arg).strip())
+                current_arg = []
+        elif child_type == ")":
+            if current_arg:
+                args.append("".join(current_arg).strip())
+        else:
+            current_arg.append(span.of(child))
+    return args
+
+
+# Argument extractor for each kind of list node; other node types have no arguments
+_ARGUMENT_EXTRACTORS: Dict[str, Callable[[Node, _SpanText], List[str]]] = {
+    "parameter_list": _extract_params,
+    "argument_list": _extract_args,
+}
 
 
-class PredicateType(Enum):
-    """Query predicate types."""
+def _extract_arguments(args_node: Optional[Node]) -> List[str]:
+    """Extract arguments from argument_list or parameter_list node."""
+    if not args_node:
+        return []
 
-    EQUALS = "#eq?"
-    MATCH = "#match?"
-    NOT_EQUALS = "#not-eq?"
-    NOT_MATCH = "#not-match?"
+    extract = _ARGUMENT_EXTRACTORS.get(args_node.type)
+    if extract is None:
+        return []
+
+    # Decode the whole list once and slice each child's text out of it
+    raw = args_node.text or b""
+    decoded = raw.decode("utf8")
+    span = _SpanText(raw, decoded if len(decoded) == len(raw) else None, args_node.start_byte)
+    return extract(args_node, span)
+
+
+def _argument_equals(args: List[str], *, arg_pos: int, arg_val: str) -> bool:
+    """Whether the argument at arg_pos is arg_val, ignoring surrounding whitespace."""
+    return arg_pos < len(args) and args[arg_pos].strip() == arg_val
+
+
+def _arguments_match(args: List[str], *, expected: Tuple[Tuple[int, str], ...]) -> bool:
+    """Whether every (position, value) pair in expected holds, ignoring surrounding whitespace."""
+    return all(_argument_equals(args, arg_pos=arg_pos, arg_val=arg_val) for arg_pos, arg_val in expected)
 
 
 class MacroFinder:
@@ -51,125 +207,140 @@ class MacroFinder:
     Focuses on code reuse and clean architecture.
     """
 
-    __slots__ = ("language", "parser", "_query_cache")
-
-    # Single query template for all macro searches
-    QUERY_TEMPLATE = """
-    [
-      ((call_expression
-        function: (identifier) @macro_name {predicate}
-        arguments: (argument_list) @args
-      ) @macro_usage)
-      
-      ((function_definition
-        declarator: (function_declarator
-          declarator: (identifier) @macro_name {predicate}
-          parameters: (parameter_list) @args
-        )
-      ) @macro_usage)
-    ]
-    """
+    __slots__ = ("language", "parser", "_parsed_keys")
 
     def __init__(self):
-        self.language = Language(tscpp.language())
+        self.language = _CPP_LANGUAGE
         self.parser = Parser(self.language)
-        self._query_cache = {}
+        # Keys of the shared tree cache entries inserted inside a with block, released on
+        # __exit__. Outside one nothing is recorded, so a long-lived finder holds no sources
+        self._parsed_keys: Optional[Set[Tuple[Language, bytes]]] = None
 
     # ==================== Public API ====================
 
     def find_by_name(self, source: bytes, name: str) -> List[MacroResult]:
         """Find all macros with exact name match."""
-        return self._execute_query(source, self._build_query(PredicateType.EQUALS, name))
+        target = name.encode("utf8")
+        # A macro's name appears verbatim in the source; without it there is nothing to parse for
+        if target not in source:
+            return []
+        return self._execute_query(source, target.__eq__)
 
     def find_by_pattern(self, source: bytes, pattern: str) -> List[MacroResult]:
         """Find all macros matching regex pattern."""
-        return self._execute_query(source, self._build_query(PredicateType.MATCH, pattern))
+        try:
+            regex = re.compile(pattern.encode("utf8"))
+        except re.error as e:
+            logger.error(f"Invalid macro pattern {pattern!r}: {e}")
+            return []
+        return self._execute_query(source, regex.search)
 
     def find_by_argument(self, source: bytes, name: str, arg_pos: int, arg_val: str) -> List[MacroResult]:
         """Find macros where specific argument has specific value."""
+        target = name.encode("utf8")
+        if target not in source:
+            return []
+        arg_filter = partial(_argument_equals, arg_pos=arg_pos, arg_val=arg_val)
+        return self._execute_query(source, target.__eq__, args_filter=arg_filter)
 
-        def arg_filter(result: MacroResult) -> bool:
-            args = result["arguments"]
-            return arg_pos < len(args) and args[arg_pos].strip() == arg_val
+    def find_by_arguments(self, source: bytes, name: str, arg_filters: Dict[str, str]) -> List[MacroResult]:
+        """
+        Find macros whose arguments match every filter.
+
+        Args:
+            source: Source code bytes
+            name: Macro name
+            arg_filters: Argument values by position key, e.g. {'arg0': 'value'}; keys not
+                starting with "arg" are ignored
 
-        return self._execute_query(source, self._build_query(PredicateType.EQUALS, name), filter_fn=arg_filter)
+        Returns:
+            Matching macros in document order
+        """
+        target = name.encode("utf8")
+        if target not in source:
+            return []
+        expected = tuple((int(key[3:]), value) for key, value in arg_filters.items() if key.startswith("arg"))
+        # Rejected macros are dropped inside the query loop, before their results are built
+        arg_filter = partial(_arguments_match, expected=expected) if expected else None
+        return self._execute_query(source, target.__eq__, args_filter=arg_filter)
 
     def find_all(self, source: bytes, names: List[str]) -> List[MacroResult]:
         """Find all occurrences of multiple macro names."""
-        # Use regex alternation for efficiency
-        pattern = "|".join(f"^{name}$" for name in names)
-        return self.find_by_pattern(source, pattern)
+        # Exact names need no regex: a set lookup on each name's bytes. Names absent from
+        # the source are dropped up front; if none is left the source is never parsed
+        wanted = frozenset(target for target in (name.encode("utf8") for name in names) if target in source)
+        if not wanted:
+            return []
+        return self._execute_query(source, wanted.__contains__)
 
     def walk_tree(self, source: bytes, names: List[str]) -> List[MacroResult]:
         """Alternative tree-walking approach for simple searches."""
-        tree = self.parser.parse(source)
+        tree = parse_cached(self.parser, source, self._parsed_keys)
         names_set = set(names)
         results = []
 
-        def visit(node: Node):
+        for node in iter_nodes(tree.root_node):
             result = self._check_node_for_macro(node, names_set)
             if result:
                 results.append(result)
 
-            for child in node.children:
-                visit(child)
-
-        visit(tree.root_node)
         return results
 
     # ==================== Private DRY Methods ====================
 
-    def _build_query(self, predicate_type: PredicateType, value: str) -> str:
-        """Build query string with specified predicate."""
-        predicate = f'({predicate_type.value} @macro_name "{value}")'
-        return self.QUERY_TEMPLATE.format(predicate=predicate)
-
-    @lru_cache(maxsize=32)
-    def _get_query(self, query_text: str) -> Query:
-        """Get or create cached Query object."""
-        return Query(self.language, query_text)
-
     def _execute_query(
-        self, source: bytes, query_text: str, filter_fn: Optional[Callable[[MacroResult], bool]] = None
+        self,
+        source: bytes,
+        name_matcher: Callable[[bytes], Any],
+        args_filter: Optional[Callable[[List[str]], bool]] = None,
     ) -> List[MacroResult]:
-        """Execute query and process results with optional filtering."""
-        tree = self.parser.parse(source)
+        """
+        Run the shared macro query and build results for the macros whose name matches.
 
-        try:
-            query = self._get_query(query_text)
-            cursor = QueryCursor(query)
-            matches = cursor.matches(tree.root_node)
+        Args:
+            source: Source code bytes
+            name_matcher: Called with each macro's name bytes; a truthy return keeps the macro
+            args_filter: Optional check on each matching macro's arguments
 
-            return self._process_matches(matches, filter_fn)
-        except Exception as e:
-            logger.error(f"Query failed: {e}")
-            return []
+        Returns:
+            Matching macros in document order
+        """
+        tree = parse_cached(self.parser, source, self._parsed_keys)
+        matches = QueryCursor(_MACRO_QUERY).matches(tree.root_node)
 
-    def _process_matches(self, matches, filter_fn: Optional[Callable[[MacroResult], bool]] = None) -> List[MacroResult]:
-        """Process query matches into results with optional filtering."""
         results = []
-
-        for pattern_index, captures in matches:
+        for _, captures in matches:
             macro_nodes = captures.get("macro_usage", [])
             macro_name_nodes = captures.get("macro_name", [])
             args_nodes = captures.get("args", [])
 
-            if not (macro_nodes and args_nodes):
+            if not (macro_nodes and args_nodes and macro_name_nodes):
                 continue
 
-            # Build result
-            result = self._build_result(
-                macro_nodes[0], args_nodes[0], macro_name_nodes[0] if macro_name_nodes else None
-            )
+            # Names are compared as bytes, so macros that don't match are never built
+            if not name_matcher(macro_name_nodes[0].text or b""):
+                continue
 
-            # Apply filter if provided
-            if filter_fn is None or filter_fn(result):
-                results.append(result)
+            # Arguments are checked before the rest of the result is built; without a
+            # filter they are left for the result to decode on first access
+            arguments = None
+            if args_filter is not None:
+                arguments = _extract_arguments(args_nodes[0])
+                if not args_filter(arguments):
+                    continue
+
+            results.append(self._build_result(macro_nodes[0], args_nodes[0], macro_name_nodes[0], arguments))
 
         return results
 
-    def _build_result(self, macro_node: Node, args_node: Node, name_node: Optional[Node] = None) -> MacroResult:
-        """Build a MacroResult from nodes."""
+    def _build_result(
+        self,
+        macro_node: Node,
+        args_node: Optional[Node],
+        name_node: Optional[Node] = None,
+        arguments: Optional[List[str]] = None,
+    ) -> MacroResult:
+        """Build a MacroResult from nodes, keeping arguments if they were already extracted."""
         # Extract macro name
         if name_node:
             macro_name = node_text(name_node)
@@ -182,8 +353,6 @@ class MacroFinder:
 
         return MacroResult(
             macro=macro_name,
-            arguments=self._extract_arguments(args_node),
-            text=self._extract_text(macro_node, full_body=False),
             start_byte=macro_node.start_byte,
             end_byte=macro_node.end_byte,
             start_point=(macro_node.start_point.row, macro_node.start_point.column),
@@ -192,20 +361,9 @@ class MacroFinder:
             type=node_type,
             node=macro_node,
             args_node=args_node,
+            _arguments=arguments,
         )
 
-    def _extract_text(self, node: Node, full_body: bool = False) -> str:
-        """Extract text from node with optional body truncation."""
-        text = node_text(node)
-
-        if not full_body and node.type == "function_definition":
-            # Truncate at first brace for function definitions
-            brace_pos = text.find("{")
-            if brace_pos > 0:
-                text = text[:brace_pos].strip()
-
-        return text
-
     def _extract_macro_name(self, node: Node) -> str:
         """Extract macro name from a macro usage node."""
         if node.type == "call_expression":
@@ -220,42 +378,6 @@ class MacroFinder:
                     return node_text(func_id)
         return ""
 
-    def _extract_arguments(self, args_node: Optional[Node]) -> List[str]:
-        """Extract arguments from argument_list or parameter_list node."""
-        if not args_node:
-            return []
-
-        args = []
-
-        if args_node.type == "parameter_list":
-            # Handle function definition parameters
-            for child in args_node.children:
-                if child.type == "parameter_declaration":
-                    # Extract parameter name (last identifier)
-                    tokens = node_text(child).split()
-                    if tokens:
-                        args.append(tokens[-1])
-                elif child.type not in ("(", ")", ","):
-                    args.append(node_text(child).strip())
-
-        elif args_node.type == "argument_list":
-            # Handle function call arguments
-            current_arg = []
-            for child in args_node.children:
-                if child.type == "(":
-                    continue
-                elif child.type == ",":
-                    if current_arg:
-                        args.append("".join(current_arg).strip())
-                        current_arg = []
-                elif child.type == ")":
-                    if current_arg:
-                        args.append("".join(current_arg).strip())
-                else:
-                    current_arg.append(node_text(child))
-
-        return args
-
     def _check_node_for_macro(self, node: Node, names: set) -> Optional[MacroResult]:
         """Check if node is a macro call/definition matching any of the names."""
         if node.type == "call_expression":
@@ -279,42 +401,67 @@ class MacroFinder:
         return None
 
     def find_markers_in_node(self, node: Node) -> Dict[str, Tuple[int, int]]:
-        """Find comment markers within a node."""
+        """
+        Find comment markers within a node, as (start_line, end_line) of the marker comments.
+
+        Results are cached by a digest of the node's bytes, so macros generated from one
+        template share a single scan.
+        """
+        base = node.start_point.row
+        key = hashlib.blake2b(node.text or b"", digest_size=16).digest()
+
+        rows = _marker_rows_cache.get(key)
+        if rows is None:
+            rows = {
+                name: (start.start_point.row - base, end.start_point.row - base)
+                for name, (start, end) in self._find_marker_comments(node).items()
+            }
+            _marker_rows_cache[key] = rows
+            if len(_marker_rows_cache) > MARKER_CACHE_SIZE:
+                _marker_rows_cache.popitem(last=False)
+        else:
+            _marker_rows_cache.move_to_end(key)
+
+        first_line = base + 1
+        return {name: (first_line + start, first_line + end) for name, (start, end) in rows.items()}
+
+    def _find_marker_comments(self, node: Node) -> Dict[str, Tuple[Node, Node]]:
+        """Find comment markers within a node, as their (start, end) comment nodes."""
         markers = {}
 
-        # Query for comments
-        comment_query = Query(self.language, "(comment) @comment")
-        cursor = QueryCursor(comment_query)
-        matches = cursor.matches(node)
+        # Open start comments per marker name; a stack per name lets markers nest
+        pending: Dict[str, List[Node]] = {}
 
-        current_marker = None
-        start_line = None
+        # Only comments holding a //@@ marker are visited, found by a bytes scan
+        for comment_node in marker_comments(node):
+            # Scan the raw bytes; only a marker's name is ever decoded
+            raw = comment_node.text or b""
 
-        for _, captures in matches:
-            for comment_node in captures.get("comment", []):
-                text = node_text(comment_node)
-
-                # Check for start marker
-                if "//@@start" in text:
-                    parts = text.split("//@@start")
-                    if len(parts) > 1:
-                        marker_name = parts[1].strip()
-                        current_marker = marker_name
-                        start_line = comment_node.start_point.row + 1
-
-                # Check for end marker
-                elif "//@@end" in text and current_marker:
-                    parts = text.split("//@@end")
-                    if len(parts) > 1:
-                        end_marker = parts[1].strip()
-                        if end_marker == current_marker:
-                            end_line = comment_node.start_point.row + 1
-                            markers[current_marker] = (start_line, end_line)
-                            current_marker = None
-                            start_line = None
+            # Check for start marker
+            if b"//@@start" in raw:
+                marker_name = raw.split(b"//@@start", 1)[1].strip().decode("utf8")
+                pending.setdefault(marker_name, []).append(comment_node)
+
+            # Check for end marker
+            elif b"//@@end" in raw:
+                marker_name = raw.split(b"//@@end", 1)[1].strip().decode("utf8")
+                starts = pending.get(marker_name)
+                if starts:
+                    markers[marker_name] = (starts.pop(), comment_node)
 
         return markers
 
+    def _find_single_macro(self, source: bytes, name: str, arg_filters: Optional[Dict[str, str]] = None) -> MacroResult:
+        """Find the one macro named name whose arguments match arg_filters (e.g. {'arg0': 'value'})."""
+        results = self.find_by_arguments(source, name, arg_filters or {})
+
+        if not results:
+            raise ValueError(f"Macro {name} not found")
+        if len(results) > 1:
+            raise ValueError("Multiple macros found, be more specific")
+
+        return results[0]
+
     def find_markers_in_macro(
         self, source: bytes, name: str, arg_filters: Optional[Dict[str, str]] = None
     ) -> Dict[str, Any]:
@@ -325,32 +472,10 @@ class MacroFinder:
         - 'macro': The macro info
         - 'markers': Dict of marker_name -> (start_line, end_line) within the macro
         """
-        results = self.find_by_name(source, name)
-
-        # Filter by arguments if specified
-        if arg_filters:
-            filtered = []
-            for r in results:
-                match = True
-                for key, value in arg_filters.items():
-                    if key.startswith("arg"):
-                        pos = int(key[3:])
-                        if pos >= len(r["arguments"]) or r["arguments"][pos].strip() != value:
-                            match = False
-                            break
-                if match:
-                    filtered.append(r)
-            results = filtered
-
-        if not results:
-            raise ValueError(f"Macro {name} not found")
-        if len(results) > 1:
-            raise ValueError("Multiple macros found, be more specific")
-
-        result = results[0]
+        result = self._find_single_macro(source, name, arg_filters)
 
         # Now find markers within this node
-        markers = self.find_markers_in_node(result["node"])
+        markers = self.find_markers_in_node(result.node)
 
         return {"macro": result, "markers": markers}
 
@@ -369,37 +494,36 @@ class MacroFinder:
         Returns:
             The code between the markers
         """
-        info = self.find_markers_in_macro(source, macro_name, arg_filters)
+        result = self._find_single_macro(source, macro_name, arg_filters)
+        markers = self._find_marker_comments(result.node)
 
-        if marker_name not in info["markers"]:
-            available = ", ".join(info["markers"].keys())
+        if marker_name not in markers:
+            available = ", ".join(markers.keys())
             raise ValueError(f"Marker '{marker_name}' not found. Available: {available}")
 
-        start_line, end_line = info["markers"][marker_name]
-
-        # Convert to source-relative lines
-        lines = source.decode("utf8").splitlines()
-
-        # Extract the marked section
-        section_lines = lines[start_line - 1 : end_line]
-
-        # Remove the marker comments themselves
-        if section_lines and "//@@start" in section_lines[0]:
-            section_lines = section_lines[1:]
-        if section_lines and "//@@end" in section_lines[-1]:
-            section_lines = section_lines[:-1]
+        start_comment, end_comment = markers[marker_name]
 
-        return "\n".join(section_lines)
+        # The section spans the lines strictly between the marker comments' lines. Slice
+        # those bytes straight out of the source and decode only them; lines are rejoined
+        # with "\n" so CRLF sources give the same text as LF ones.
+        start = source.find(b"\n", start_comment.end_byte) + 1
+        end = source.rfind(b"\n", 0, end_comment.start_byte)
+        if start <= 0 or end < start:
+            return ""
+        return b"\n".join(source[start:end].splitlines()).decode("utf8")
 
     # ==================== Context Manager Support ====================
 
     def __enter__(self):
         """Support for context manager usage."""
+        self._parsed_keys = set()
         return self
 
     def __exit__(self, exc_type, exc_val, exc_tb):
-        """Clear cache on exit."""
-        self._get_query.cache_clear()
+        """Release the cached parse trees this finder inserted; trees other finders parsed stay cached."""
+        if self._parsed_keys is not None:
+            release_trees(self._parsed_keys)
+            self._parsed_keys = None
         return False
 
 
@@ -441,38 +565,42 @@ def demo():
         print("\n1. Find by exact name (DEFINE_JS_FUNCTION):")
         results = finder.find_by_name(sample_code, "DEFINE_JS_FUNCTION")
         for r in results:
-            print(f"  Line {r['line']}: {r['macro']}({', '.join(r['arguments'])}) [{r['type']}]")
+            print(f"  Line {r.line}: {r.macro}({', '.join(r.arguments)}) [{r.type}]")
 
         # Test 2: Find by pattern
         print("\n2. Find by pattern (^DEFINE_):")
         results = finder.find_by_pattern(sample_code, "^DEFINE_")
         for r in results:
-            print(f"  Line {r['line']}: {r['macro']}({', '.join(r['arguments'])}) [{r['type']}]")
+            print(f"  Line {r.line}: {r.macro}({', '.join(r.arguments)}) [{r.type}]")
 
         # Test 3: Find by argument value
         print("\n3. Find DEFINE_* with 'data' as 3rd argument:")
         results = finder.find_by_argument(sample_code, "DEFINE_JS_FUNCTION", 2, "data")
         for r in results:
-            print(f"  Line {r['line']}: {r['macro']}({', '.join(r['arguments'])})")
+            print(f"  Line {r.line}: {r.macro}({', '.join(r.arguments)})")
 
         # Test 4: Find multiple macros
         print("\n4. Find multiple specific macros:")
         results = finder.find_all(sample_code, ["SOME_MACRO", "DEBUG_LOG", "ASSERT_EQ"])
         for r in results:
-            print(f"  Line {r['line']}: {r['macro']}({', '.join(r['arguments'])}) [{r['type']}]")
+            print(f"  Line {r.line}: {r.macro}({', '.join(r.arguments)}) [{r.type}]")
 
         # Test 5: Tree walking
         print("\n5. Tree walking for DEFINE_JS_FUNCTION:")
         results = finder.walk_tree(sample_code, ["DEFINE_JS_FUNCTION"])
         for r in results:
-            print(f"  Line {r['line']}: {r['macro']}({', '.join(r['arguments'])}) [{r['type']}]")
+            print(f"  Line {r.line}: {r.macro}({', '.join(r.arguments)}) [{r.type}]")
 
         # Show result structure
         if results:
             print("\n6. Example MacroResult structure:")
             import json
 
-            print(json.dumps(results[0], indent=2))
+            # Tree-sitter nodes are not JSON serializable
+            result = results[0]
+            keys = ("macro", "arguments", "text", "start_byte", "end_byte", "start_point", "end_point", "line", "type")
+            shown = {key: result[key] for key in keys}
+            print(json.dumps(shown, indent=2))
 
 
 if __name__ == "__main__":
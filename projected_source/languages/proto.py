@@ -7,12 +7,16 @@ Uses coder3101/tree-sitter-proto grammar which supports both proto2 and proto3.
 import ctypes
 import logging
 import re
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from itertools import repeat
 from pathlib import Path
-from typing import Dict, Optional, Tuple
+from typing import Dict, List, Optional, Tuple
 
-from tree_sitter import Language, Node, Parser
+from tree_sitter import Language, Node, Parser, Tree
 
 from ..core.extractor import BaseExtractor
+from .utils import MARKER_PREFIX, iter_nodes, parse_cached, reparse_cached
 
 logger = logging.getLogger(__name__)
 
@@ -20,8 +24,9 @@ logger = logging.getLogger(__name__)
 _PROTO_SO_PATH = Path(__file__).parent / "proto_grammar" / "proto.so"
 
 
+@lru_cache(maxsize=None)
 def _load_proto_language() -> Language:
-    """Load the proto language from the bundled .so file."""
+    """Load the proto language from the bundled .so file, once per process."""
     if not _PROTO_SO_PATH.exists():
         raise RuntimeError(
             f"Proto grammar not found at {_PROTO_SO_PATH}. See .ai-docs/proto-investigations.md for build instructions."
@@ -31,6 +36,28 @@ def _load_proto_language() -> Language:
     return Language(lib.tree_sitter_proto())
 
 
+# Node types whose children can include message, enum or service definitions (ERROR too,
+# as it can wrap them after a syntax error); fields, options and enum bodies never do, so
+# finders skip their subtrees
+_DEFINITION_CONTAINERS = frozenset(["source_file", "message", "message_body", "ERROR"])
+
+
+def _holds_definitions(node: Node) -> bool:
+    """Whether node's children can include message, enum or service definitions."""
+    return node.type in _DEFINITION_CONTAINERS
+
+
+# Any marker line; one match per line tells both whether it is a marker and which kind
+_MARKER_RE = re.compile(r"^\s*//@@(?P<kind>start|end)\s+(?P<name>[\w-]+)\s*$")
+
+
+@lru_cache(maxsize=128)
+def _marker_patterns(marker_name: str) -> Tuple["re.Pattern[bytes]", "re.Pattern[bytes]"]:
+    """Compiled start and end line patterns for one marker name, matched against raw lines."""
+    name = re.escape(marker_name.encode("utf8"))
+    return re.compile(rb"^\s*//@@start\s+" + name + rb"\s*$"), re.compile(rb"^\s*//@@end\s+" + name + rb"\s*$")
+
+
 class ProtoExtractor(BaseExtractor):
     """Protocol Buffers extractor with message/enum extraction support."""
 
@@ -39,6 +66,24 @@ class ProtoExtractor(BaseExtractor):
         super().__init__(self._language)
         self._parser = Parser(self._language)
 
+    def _parse(self, file_path: Path) -> Tree:
+        """Parse a file, reusing the tree from an earlier parse of the same contents."""
+        return parse_cached(self._parser, self._read(file_path))
+
+    def reparse(self, old_source: bytes, new_source: bytes, **edit) -> Tree:
+        """
+        Incrementally parse an edited source so later extractions from it skip a full parse.
+
+        Args:
+            old_source: Source bytes before the edit (parsed earlier by this extractor)
+            new_source: Source bytes after the edit
+            **edit: Tree.edit keyword arguments describing the change
+
+        Returns:
+            The parse tree for new_source
+        """
+        return reparse_cached(self._parser, old_source, new_source, **edit)
+
     def extract_message(self, file_path: Path, message_name: str) -> Tuple[str, int, int]:
         """
         Extract a message definition by name.
@@ -50,8 +95,7 @@ class ProtoExtractor(BaseExtractor):
         Returns:
             Tuple of (code_text, start_line, end_line)
         """
-        source = file_path.read_bytes()
-        tree = self._parser.parse(source)
+        tree = self._parse(file_path)
 
         node = self._find_message(tree.root_node, message_name)
         if not node:
@@ -71,8 +115,7 @@ class ProtoExtractor(BaseExtractor):
         Returns:
             Tuple of (code_text, start_line, end_line)
         """
-        source = file_path.read_bytes()
-        tree = self._parser.parse(source)
+        tree = self._parse(file_path)
 
         node = self._find_enum(tree.root_node, enum_name)
         if not node:
@@ -92,8 +135,7 @@ class ProtoExtractor(BaseExtractor):
         Returns:
             Tuple of (code_text, start_line, end_line)
         """
-        source = file_path.read_bytes()
-        tree = self._parser.parse(source)
+        tree = self._parse(file_path)
 
         node = self._find_service(tree.root_node, service_name)
         if not node:
@@ -102,6 +144,38 @@ class ProtoExtractor(BaseExtractor):
         text = node.text.decode("utf8") if node.text else ""
         return text, node.start_point.row + 1, node.end_point.row + 1
 
+    def extract_many(
+        self, targets: List[Tuple[Path, str]], kind: str = "message", max_workers: Optional[int] = None
+    ) -> List[Tuple[str, int, int]]:
+        """
+        Extract definitions of one kind from many files, spread over worker processes.
+
+        Parsing is CPU-bound and a Parser is single-threaded, so each worker process creates
+        its own extractor once and handles a share of the targets. Only the extracted text
+        and line numbers travel back; trees cannot be pickled.
+
+        Args:
+            targets: (file_path, name) pairs to extract
+            kind: "message", "enum" or "service"
+            max_workers: Number of worker processes (default: one per CPU); 1 runs in-process
+
+        Returns:
+            One (code_text, start_line, end_line) tuple per target, in order
+
+        Raises:
+            ValueError: If kind is unknown, or a definition is not found
+        """
+        if kind not in _EXTRACT_METHODS:
+            raise ValueError(f"Unknown definition kind '{kind}' (expected one of: {', '.join(_EXTRACT_METHODS)})")
+
+        if len(targets) < 2 or max_workers == 1:
+            return [_extract(self, kind, file_path, name) for file_path, name in targets]
+
+        paths = [file_path for file_path, _ in targets]
+        names = [name for _, name in targets]
+        with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker) as pool:
+            return list(pool.map(_extract_in_worker, repeat(kind), paths, names))
+
     def extract_marker(self, file_path: Path, marker_name: str) -> Tuple[str, int, int]:
         """
         Extract content between marker comments.
@@ -118,30 +192,34 @@ class ProtoExtractor(BaseExtractor):
         Returns:
             Tuple of (code_text, start_line, end_line)
         """
-        content = file_path.read_text()
-        lines = content.splitlines()
-
-        start_pattern = re.compile(rf"^\s*//@@start\s+{re.escape(marker_name)}\s*$")
-        end_pattern = re.compile(rf"^\s*//@@end\s+{re.escape(marker_name)}\s*$")
+        start_pattern, end_pattern = _marker_patterns(marker_name)
 
         start_line = None
         end_line = None
-
-        for i, line in enumerate(lines):
-            if start_pattern.match(line):
-                start_line = i + 1  # 1-indexed
-            elif end_pattern.match(line) and start_line is not None:
-                end_line = i + 1
-                break
+        section: List[bytes] = []
+
+        # Stream raw lines and stop at the end marker: nothing after it is read, and only
+        # the section itself is decoded. The substring checks keep the regexes off
+        # ordinary lines.
+        with file_path.open("rb") as f:
+            for i, raw in enumerate(f, 1):
+                line = raw.rstrip(b"\r\n")
+                if b"//@@start" in line and start_pattern.match(line):
+                    start_line = i
+                    section = []
+                elif start_line is not None:
+                    if b"//@@end" in line and end_pattern.match(line):
+                        end_line = i
+                        break
+                    section.append(line)
 
         if start_line is None:
             raise ValueError(f"Marker '//@@start {marker_name}' not found in {file_path}")
         if end_line is None:
             raise ValueError(f"Marker '//@@end {marker_name}' not found in {file_path}")
 
-        # Extract lines between markers (exclusive of marker lines)
-        extracted_lines = lines[start_line : end_line - 1]
-        text = "\n".join(extracted_lines)
+        # Lines between markers (exclusive of marker lines)
+        text = b"\n".join(section).decode("utf8")
 
         return text, start_line + 1, end_line - 1
 
@@ -157,8 +235,7 @@ class ProtoExtractor(BaseExtractor):
         Returns:
             Tuple of (code_text, start_line, end_line)
         """
-        source = file_path.read_bytes()
-        tree = self._parser.parse(source)
+        tree = self._parse(file_path)
 
         node = self._find_message(tree.root_node, message_name)
         if not node:
@@ -191,50 +268,63 @@ class ProtoExtractor(BaseExtractor):
         Returns:
             The matching node or None
         """
-        if node.type == def_type:
-            for child in node.children:
-                if child.type == name_type:
-                    if child.text and child.text.decode("utf8") == target_name:
-                        return node
-
-        # Recurse into children
-        for child in node.children:
-            result = self._find_definition(child, def_type, name_type, target_name)
-            if result:
-                return result
+        target = target_name.encode("utf8")
+
+        # Walk the subtree iteratively, entering only nodes that can hold definitions; the
+        # first match in document order wins
+        for current in iter_nodes(node, _holds_definitions):
+            if current.type == def_type:
+                for child in current.children:
+                    if child.type == name_type and child.text == target:
+                        return current
 
         return None
 
     def _extract_marker_from_node(
         self, file_path: Path, node: Node, marker_name: str, context: str
     ) -> Tuple[str, int, int]:
-        """Extract marker content from within a node."""
-        text = node.text.decode("utf8") if node.text else ""
-        lines = text.splitlines()
+        """
+        Extract marker content from within a node.
+
+        Only lines holding //@@ are looked at: the node's bytes are searched for the marker
+        prefix and each hit's line is checked against the marker patterns.
+        """
+        data = node.text or b""
         node_start_line = node.start_point.row + 1
 
-        start_pattern = re.compile(rf"^\s*//@@start\s+{re.escape(marker_name)}\s*$")
-        end_pattern = re.compile(rf"^\s*//@@end\s+{re.escape(marker_name)}\s*$")
+        start_pattern, end_pattern = _marker_patterns(marker_name)
 
-        start_idx = None
-        end_idx = None
+        # (start, end) byte offsets, within data, of the marker lines
+        start_span = None
+        end_span = None
 
-        for i, line in enumerate(lines):
+        pos = data.find(MARKER_PREFIX)
+        while pos != -1:
+            line_start = data.rfind(b"\n", 0, pos) + 1
+            line_end = data.find(b"\n", pos)
+            if line_end == -1:
+                line_end = len(data)
+
+            line = data[line_start:line_end]
             if start_pattern.match(line):
-                start_idx = i
-            elif end_pattern.match(line) and start_idx is not None:
-                end_idx = i
+                start_span = (line_start, line_end)
+            elif start_span is not None and end_pattern.match(line):
+                end_span = (line_start, line_end)
                 break
 
-        if start_idx is None:
+            pos = data.find(MARKER_PREFIX, line_end)
+
+        if start_span is None:
             raise ValueError(f"Marker '//@@start {marker_name}' not found in {context}")
-        if end_idx is None:
+        if end_span is None:
             raise ValueError(f"Marker '//@@end {marker_name}' not found in {context}")
 
         # Extract lines between markers (exclusive)
-        extracted_lines = lines[start_idx + 1 : end_idx]
-        extracted_text = "\n".join(extracted_lines)
+        section = data[start_span[1] + 1 : end_span[0]]
+        extracted_text = b"\n".join(section.splitlines()).decode("utf8")
 
+        start_idx = data.count(b"\n", 0, start_span[0])
+        end_idx = start_idx + data.count(b"\n", start_span[0], end_span[0])
         start_line = node_start_line + start_idx + 1
         end_line = node_start_line + end_idx - 1
 
@@ -251,22 +341,46 @@ class ProtoExtractor(BaseExtractor):
         lines = content.splitlines()
 
         markers: Dict[str, Tuple[int, int]] = {}
-        start_pattern = re.compile(r"^\s*//@@start\s+([\w-]+)\s*$")
-        end_pattern = re.compile(r"^\s*//@@end\s+([\w-]+)\s*$")
-
         open_markers: Dict[str, int] = {}
 
         for i, line in enumerate(lines):
-            start_match = start_pattern.match(line)
-            if start_match:
-                name = start_match.group(1)
-                open_markers[name] = i + 1
+            match = _MARKER_RE.match(line)
+            if not match:
+                continue
 
-            end_match = end_pattern.match(line)
-            if end_match:
-                name = end_match.group(1)
-                if name in open_markers:
-                    markers[name] = (open_markers[name], i + 1)
-                    del open_markers[name]
+            name = match["name"]
+            if match["kind"] == "start":
+                open_markers[name] = i + 1
+            elif name in open_markers:
+                markers[name] = (open_markers.pop(name), i + 1)
 
         return markers
+
+
+# ProtoExtractor method that extracts each definition kind
+_EXTRACT_METHODS = {
+    "message": ProtoExtractor.extract_message,
+    "enum": ProtoExtractor.extract_enum,
+    "service": ProtoExtractor.extract_service,
+}
+
+
+def _extract(extractor: ProtoExtractor, kind: str, file_path: Path, name: str) -> Tuple[str, int, int]:
+    """Extract one definition of the given kind."""
+    return _EXTRACT_METHODS[kind](extractor, file_path, name)
+
+
+# Extractor owned by each extract_many worker process
+_worker_extractor: Optional[ProtoExtractor] = None
+
+
+def _init_worker():
+    """Create the worker process's extractor once, before it handles any target."""
+    global _worker_extractor
+    _worker_extractor = ProtoExtractor()
+
+
+def _extract_in_worker(kind: str, file_path: Path, name: str) -> Tuple[str, int, int]:
+    """Run one extraction with the worker process's extractor."""
+    assert _worker_extractor is not None, "worker extractor not initialized"
+    return _extract(_worker_extractor, kind, file_path, name)
@@ -2,7 +2,18 @@
 Utility functions for language extractors.
 """
 
-from tree_sitter import Node
+from collections import OrderedDict
+from typing import Callable, Iterable, Iterator, Optional, Set, Tuple
+
+from tree_sitter import Language, Node, Parser, Tree
+
+# Number of recently parsed sources whose trees parse_cached keeps for reuse
+TREE_CACHE_SIZE = 16
+
+_tree_cache: "OrderedDict[Tuple[Language, bytes], Tree]" = OrderedDict()
+
+# Every //@@start and //@@end marker comment begins with this prefix
+MARKER_PREFIX = b"//@@"
 
 
 def node_text(node: Node) -> str:
@@ -15,4 +26,187 @@ def node_text(node: Node) -> str:
     Returns:
         The node's text content as a string, or empty string if text is None.
     """
-    return node.text.decode("utf8") if node.text else ""
+    # Node.text copies the span out of the tree's source on every access; fetch it once
+    text = node.text
+    return text.decode("utf8") if text else ""
+
+
+def parse_cached(parser: Parser, source: bytes, inserted: Optional[Set[Tuple[Language, bytes]]] = None) -> Tree:
+    """
+    Parse source, reusing the tree from an earlier parse of the same bytes.
+
+    The cache is shared by every finder, so extracting several macros and types from
+    one file parses it once. Entries are keyed by language and the source bytes
+    themselves (bytes cache their hash) and evicted least recently used first.
+
+    Args:
+        parser: Parser to use on a cache miss
+        source: Source code bytes
+        inserted: Optional set that receives the cache key on a miss, so the caller can
+            later hand its own entries to release_trees
+
+    Returns:
+        The parse tree for source
+    """
+    language = parser.language
+    assert language is not None  # Parsers here are always built with a language
+    key = (language, source)
+    tree = _tree_cache.get(key)
+    if tree is not None:
+        _tree_cache.move_to_end(key)
+        return tree
+
+    tree = parser.parse(source)
+    _tree_cache[key] = tree
+    if inserted is not None:
+        inserted.add(key)
+    if len(_tree_cache) > TREE_CACHE_SIZE:
+        _tree_cache.popitem(last=False)
+    return tree
+
+
+def reparse_cached(parser: Parser, old_source: bytes, new_source: bytes, **edit) -> Tree:
+    """
+    Parse an edited source incrementally from the cached tree of the source before the edit.
+
+    Tree-sitter reuses every subtree the edit did not touch, so a small edit costs far less
+    than a full parse. The new tree joins the cache, so later lookups on new_source reuse it.
+    Falls back to a full parse when old_source has no cached tree.
+
+    Args:
+        parser: Parser to use
+        old_source: Source bytes before the edit
+        new_source: Source bytes after the edit
+        **edit: Tree.edit keyword arguments describing the change (start_byte, old_end_byte,
+            new_end_byte, start_point, old_end_point, new_end_point)
+
+    Returns:
+        The parse tree for new_source
+    """
+    language = parser.language
+    assert language is not None  # Parsers here are always built with a language
+    key = (language, new_source)
+    old_tree = _tree_cache.get((language, old_source))
+    if old_tree is None or key in _tree_cache:
+        return parse_cached(parser, new_source)
+
+    # Edit a copy: the cached tree stays valid for old_source
+    edited = old_tree.copy()
+    edited.edit(**edit)
+    tree = parser.parse(new_source, edited)
+    _tree_cache[key] = tree
+    if len(_tree_cache) > TREE_CACHE_SIZE:
+        _tree_cache.popitem(last=False)
+    return tree
+
+
+def clear_tree_cache() -> None:
+    """
+    Drop every tree held by parse_cached.
+
+    Each tree keeps its whole syntax tree in C memory, often many times the size of its
+    source, so long-running hosts can call this between batches to bound their working set.
+    Trees still referenced elsewhere (e.g. through a MacroResult's node) stay alive until
+    those references go.
+    """
+    _tree_cache.clear()
+
+
+def release_trees(keys: Iterable[Tuple[Language, bytes]]) -> None:
+    """
+    Drop the cached trees for the given keys, leaving every other entry in place.
+
+    Lets one component give back the trees it parsed (collected through parse_cached's
+    inserted argument) without discarding trees the other finders still reuse.
+    Keys already evicted are ignored.
+
+    Args:
+        keys: Cache keys recorded by parse_cached
+    """
+    for key in keys:
+        _tree_cache.pop(key, None)
+
+
+def marker_comments(node: Node) -> Iterator[Node]:
+    """
+    Yield the comment nodes within node that hold a //@@ marker, in source order.
+
+    Instead of visiting every comment, this scans the node's bytes for the marker prefix
+    (a C-level search) and resolves each hit to the comment that contains it. Hits inside
+    string literals or other non-comment nodes are skipped.
+
+    Args:
+        node: The node to search within (e.g., function body or root)
+
+    Yields:
+        Comment nodes containing MARKER_PREFIX
+    """
+    raw = node.text or b""
+    base = node.start_byte
+    pos = raw.find(MARKER_PREFIX)
+    while pos != -1:
+        hit = node.descendant_for_byte_range(base + pos, base + pos + len(MARKER_PREFIX))
+        if hit is not None and hit.type == "comment":
+            yield hit
+            # A comment is one marker at most; resume the scan after it
+            pos = raw.find(MARKER_PREFIX, hit.end_byte - base)
+        else:
+            pos = raw.find(MARKER_PREFIX, pos + 1)
+
+
+def iter_nodes(node: Node, descend: Optional[Callable[[Node], bool]] = None) -> Iterator[Node]:
+    """
+    Yield node and all of its descendants in document (pre-)order.
+
+    Walks with a TreeCursor instead of recursing over Node.children, so there is no Python
+    frame per node and no children list built at every level.
+
+    Args:
+        node: Root of the subtree to walk
+        descend: Optional check on each yielded node; its children are skipped when it
+            returns False
+
+    Yields:
+        Each node of the subtree, parents before their children
+    """
+    cursor = node.walk()
+    while True:
+        current = cursor.node
+        if current is None:
+            return
+        yield current
+        if (descend is None or descend(current)) and cursor.goto_first_child():
+            continue
+        while not cursor.goto_next_sibling():
+            if not cursor.goto_parent():
+                return
+
+
+def slice_lines(data: bytes, first_line: int, start_line: int, end_line: int) -> str:
+    """
+    Decode a range of lines out of a buffer without decoding or splitting the rest of it.
+
+    Args:
+        data: Source bytes, e.g. a node's text
+        first_line: 1-based line number of data's first byte
+        start_line: First line to return (1-based, inclusive)
+        end_line: Last line to return (1-based, inclusive)
+
+    Returns:
+        The lines joined with "\n", or "" for an empty range
+    """
+    start = 0
+    for _ in range(start_line - first_line):
+        start = data.find(b"\n", start) + 1
+        if start == 0:
+            return ""
+
+    end = start
+    for _ in range(end_line - start_line + 1):
+        newline = data.find(b"\n", end)
+        if newline == -1:
+            end = len(data)
+            break
+        end = newline + 1
+
+    return b"\n".join(data[start:end].splitlines()).decode("utf8")
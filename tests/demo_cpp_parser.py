@@ -0,0 +1,230 @@
+#!/usr/bin/env python3
+"""
+Interactive demo for SimpleCppParser.
+
+Run with the package installed (e.g. `pip install -e .`):
+
+    python tests/demo_cpp_parser.py [--debug | --info]
+"""
+
+import logging
+import sys
+
+from projected_source.languages.cpp_parser import SimpleCppParser
+
+logger = logging.getLogger("projected_source.languages.cpp_parser")
+
+
+def main():
+    # Enable debug logging if --debug flag is passed
+    if "--debug" in sys.argv:
+        logger.setLevel(logging.DEBUG)
+        # Also set root logger to see tree-sitter debug info
+        logging.getLogger().setLevel(logging.DEBUG)
+    elif "--info" in sys.argv:
+        logger.setLevel(logging.INFO)
+
+    # Test the parser
+    parser = SimpleCppParser()
+
+    test_code = b"""
+    inline std::optional<std::vector<uint8_t>>
+    FromJSIntArrayOrHexString(JSContext* ctx, JSValueConst v, int max_len)
+    {
+        return {};
+    }
+    
+    static JSValue js_process_binary(JSContext *ctx, JSValueConst this_val,
+                                     int argc, JSValueConst *argv) 
+    {
+        return JS_UNDEFINED;
+    }
+    
+    class MyClass {
+    public:
+        void myMethod() {
+            // Do something
+        }
+        
+        int calculate(int x, int y) {
+            return x + y;
+        }
+    };
+    
+    struct MyStruct {
+        void structMethod() {
+            // Struct method
+        }
+    };
+    
+    // Out-of-line definition
+    void MyClass::anotherMethod() {
+        // Out-of-line implementation
+    }
+    
+    namespace utils {
+        void helperFunction() {
+            // Namespace function
+        }
+        
+        class Helper {
+        public:
+            void process() {
+                // Method in namespace class
+            }
+        };
+        
+        struct Data {
+            void validate() {
+                // Struct method in namespace
+            }
+        };
+    }
+    
+    // Out-of-line namespace class method
+    void utils::Helper::cleanup() {
+        // Out-of-line namespace class method
+    }
+    
+    namespace outer {
+        namespace inner {
+            void deepFunction() {
+                // Nested namespace function
+            }
+        }
+    }
+    
+    // Nested struct/class cases
+    struct OuterStruct {
+        struct InnerStruct {
+            void nestedMethod() {
+                // Method in struct in struct
+            }
+        };
+        
+        class InnerClass {
+        public:
+            void anotherNested() {
+                // Method in class in struct
+            }
+        };
+    };
+    
+    class OuterClass {
+    public:
+        struct InnerStruct {
+            void methodInStructInClass() {
+                // Method in struct in class
+            }
+        };
+    };
+    
+    // Out-of-line nested struct method
+    void OuterStruct::InnerStruct::outOfLineNested() {
+        // Out-of-line nested struct method
+    }
+    """
+
+    # Test regular functions
+    result = parser.extract_function_by_name(test_code, "FromJSIntArrayOrHexString")
+    if result:
+        print("Found FromJSIntArrayOrHexString:")
+        print(result)
+        print()
+
+    # Test class methods
+    result = parser.extract_function_by_name(test_code, "MyClass::calculate")
+    if result:
+        print("Found MyClass::calculate:")
+        print(result)
+        print()
+    else:
+        print("NOT FOUND: MyClass::calculate")
+
+    # Test struct methods
+    result = parser.extract_function_by_name(test_code, "MyStruct::structMethod")
+    if result:
+        print("Found MyStruct::structMethod:")
+        print(result)
+        print()
+
+    # Test out-of-line definitions
+    result = parser.extract_function_by_name(test_code, "MyClass::anotherMethod")
+    if result:
+        print("Found MyClass::anotherMethod (out-of-line):")
+        print(result)
+        print()
+
+    # Test namespace functions
+    result = parser.extract_function_by_name(test_code, "utils::helperFunction")
+    if result:
+        print("Found utils::helperFunction:")
+        print(result)
+        print()
+
+    # Test namespace class methods
+    result = parser.extract_function_by_name(test_code, "utils::Helper::process")
+    if result:
+        print("Found utils::Helper::process:")
+        print(result)
+        print()
+
+    # Test namespace struct methods
+    result = parser.extract_function_by_name(test_code, "utils::Data::validate")
+    if result:
+        print("Found utils::Data::validate:")
+        print(result)
+        print()
+
+    # Test out-of-line namespace class method
+    result = parser.extract_function_by_name(test_code, "utils::Helper::cleanup")
+    if result:
+        print("Found utils::Helper::cleanup (out-of-line):")
+        print(result)
+        print()
+
+    # Test nested namespace function
+    result = parser.extract_function_by_name(test_code, "outer::inner::deepFunction")
+    if result:
+        print("Found outer::inner::deepFunction:")
+        print(result)
+        print()
+
+    # Test nested struct methods
+    print("\n--- Testing nested struct/class methods ---")
+
+    result = parser.extract_function_by_name(test_code, "OuterStruct::InnerStruct::nestedMethod")
+    if result:
+        print("Found OuterStruct::InnerStruct::nestedMethod:")
+        print(result)
+        print()
+    else:
+        print("NOT FOUND: OuterStruct::InnerStruct::nestedMethod\n")
+
+    result = parser.extract_function_by_name(test_code, "OuterStruct::InnerClass::anotherNested")
+    if result:
+        print("Found OuterStruct::InnerClass::anotherNested:")
+        print(result)
+        print()
+    else:
+        print("NOT FOUND: OuterStruct::InnerClass::anotherNested\n")
+
+    result = parser.extract_function_by_name(test_code, "OuterClass::InnerStruct::methodInStructInClass")
+    if result:
+        print("Found OuterClass::InnerStruct::methodInStructInClass:")
+        print(result)
+        print()
+    else:
+        print("NOT FOUND: OuterClass::InnerStruct::methodInStructInClass\n")
+
+    result = parser.extract_function_by_name(test_code, "OuterStruct::InnerStruct::outOfLineNested")
+    if result:
+        print("Found OuterStruct::InnerStruct::outOfLineNested (out-of-line):")
+        print(result)
+        print()
+    else:
+        print("NOT FOUND: OuterStruct::InnerStruct::outOfLineNested\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,6 @@
 """Tests for ChangesSet - code change tracking and coverage validation."""
 
+import subprocess
 from pathlib import Path
 
 import pytest
@@ -78,6 +79,18 @@ class TestChangesSetAdd:
         assert regions[0].start_line == 10
         assert regions[0].end_line == 35
 
+    def test_add_bridging_region_merges_neighbours(self):
+        """A region touching the regions on both sides merges them, leaving others alone."""
+        cs = ChangesSet()
+        cs.add(Path("test.cpp"), 1, 3)
+        cs.add(Path("test.cpp"), 10, 20)
+        cs.add(Path("test.cpp"), 30, 40)
+        cs.add(Path("test.cpp"), 50, 60)
+        cs.add(Path("test.cpp"), 21, 29)
+
+        regions = cs.uncovered()
+        assert [(r.start_line, r.end_line) for r in regions] == [(1, 3), (10, 40), (50, 60)]
+
     def test_add_reversed_range_normalized(self):
         """Adding (end, start) normalizes to (start, end)."""
         cs = ChangesSet()
@@ -191,6 +204,26 @@ class TestChangesSetSubtract:
         assert regions[1].start_line == 33
         assert regions[1].end_line == 35
 
+    def test_subtract_many_matches_repeated_subtract(self):
+        """Subtracting a batch of claims leaves what subtracting them one by one would."""
+        claims = [(40, 31), (12, 22), (5, 8), (24, 24), (60, 70)]
+        one_by_one = ChangesSet()
+        batched = ChangesSet()
+        for cs in (one_by_one, batched):
+            cs.add(Path("test.cpp"), 10, 15)
+            cs.add(Path("test.cpp"), 20, 25)
+            cs.add(Path("test.cpp"), 30, 35)
+            cs.add(Path("test.cpp"), 50, 55)
+
+        for start, end in claims:
+            one_by_one.subtract(Path("test.cpp"), start, end)
+        batched.subtract_many(Path("test.cpp"), claims)
+
+        remaining = [str(r) for r in batched.uncovered()]
+        assert remaining == ["test.cpp:10-11", "test.cpp:23-23", "test.cpp:25-25", "test.cpp:30-30", "test.cpp:50-55"]
+        assert batched.uncovered() == one_by_one.uncovered()
+        assert len(batched) == 5
+
 
 class TestChangesSetQueries:
     """Test query methods."""
@@ -246,33 +279,33 @@ class TestChangeRegion:
         region = ChangeRegion(Path("src/main.cpp"), 10, 20)
         assert str(region) == "src/main.cpp:10-20"
 
+    def test_regions_share_file_path(self):
+        """Regions of one file hold the set's single Path for it and can be hashed."""
+        cs = ChangesSet()
+        cs.add(Path("a.cpp"), 1, 2)
+        cs.add(Path("a.cpp"), 10, 20)
+
+        first, second = cs.uncovered()
+        assert first.file_path is second.file_path is cs.files()[0]
+        assert len({first, second, ChangeRegion(Path("a.cpp"), 1, 2)}) == 2
+
 
 class TestChangesSetFromDiff:
     """Integration tests for from_diff() with real git repos."""
 
-    import shutil
-    import subprocess
-    import tempfile
-
     @pytest.fixture
-    def temp_git_repo(self):
+    def temp_git_repo(self, tmp_path, monkeypatch):
         """Create a temporary git repo with an initial commit."""
-        temp_dir = self.tempfile.mkdtemp()
-        repo_path = Path(temp_dir) / "repo"
+        # Commit identity comes from the environment instead of a git config call per key
+        for role in ("AUTHOR", "COMMITTER"):
+            monkeypatch.setenv(f"GIT_{role}_NAME", "Test")
+            monkeypatch.setenv(f"GIT_{role}_EMAIL", "test@test.com")
+
+        repo_path = tmp_path / "repo"
         repo_path.mkdir()
 
         # Initialize git repo
-        self.subprocess.run(["git", "init"], cwd=repo_path, capture_output=True)
-        self.subprocess.run(
-            ["git", "config", "user.email", "test@test.com"],
-            cwd=repo_path,
-            capture_output=True,
-        )
-        self.subprocess.run(
-            ["git", "config", "user.name", "Test"],
-            cwd=repo_path,
-            capture_output=True,
-        )
+        self._git(repo_path, "init")
 
         # Create initial file
         test_file = repo_path / "test.cpp"
@@ -284,17 +317,19 @@ class TestChangesSetFromDiff:
         )
 
         # Initial commit
-        self.subprocess.run(["git", "add", "."], cwd=repo_path, capture_output=True)
-        self.subprocess.run(
-            ["git", "commit", "-m", "Initial"],
-            cwd=repo_path,
-            capture_output=True,
-        )
+        self._commit(repo_path, "Initial")
+
+        return repo_path
 
-        yield repo_path
+    @staticmethod
+    def _git(repo_path: Path, *args: str) -> None:
+        """Run a git command in the repo."""
+        subprocess.run(["git", *args], cwd=repo_path, capture_output=True)
 
-        # Cleanup
-        self.shutil.rmtree(temp_dir)
+    def _commit(self, repo_path: Path, message: str) -> None:
+        """Stage everything and commit it."""
+        self._git(repo_path, "add", ".")
+        self._git(repo_path, "commit", "-m", message)
 
     def test_from_diff_detects_additions(self, temp_git_repo):
         """from_diff() detects added lines."""
@@ -310,12 +345,7 @@ class TestChangesSetFromDiff:
         )
 
         # Commit
-        self.subprocess.run(["git", "add", "."], cwd=temp_git_repo, capture_output=True)
-        self.subprocess.run(
-            ["git", "commit", "-m", "Add variable"],
-            cwd=temp_git_repo,
-            capture_output=True,
-        )
+        self._commit(temp_git_repo, "Add variable")
 
         # Get changes against initial commit
         cs = ChangesSet.from_diff(base="HEAD~1", repo_path=temp_git_repo)
@@ -331,11 +361,7 @@ class TestChangesSetFromDiff:
     def test_from_diff_on_feature_branch(self, temp_git_repo):
         """from_diff() works on a feature branch against main."""
         # Create a feature branch
-        self.subprocess.run(
-            ["git", "checkout", "-b", "feature"],
-            cwd=temp_git_repo,
-            capture_output=True,
-        )
+        self._git(temp_git_repo, "checkout", "-b", "feature")
 
         test_file = temp_git_repo / "test.cpp"
 
@@ -349,43 +375,75 @@ class TestChangesSetFromDiff:
         )
 
         # Commit on feature branch
-        self.subprocess.run(["git", "add", "."], cwd=temp_git_repo, capture_output=True)
-        self.subprocess.run(
-            ["git", "commit", "-m", "Change return"],
-            cwd=temp_git_repo,
-            capture_output=True,
-        )
+        self._commit(temp_git_repo, "Change return")
 
         # Should auto-detect base as merge-base with main
         cs = ChangesSet.from_diff(repo_path=temp_git_repo)
 
         assert not cs.is_complete()
+        assert cs.base == ChangesSet.detect_base(temp_git_repo)
         files = cs.files()
         assert any("test.cpp" in str(f) for f in files)
 
     def test_detect_base_finds_main(self, temp_git_repo):
         """detect_base() finds merge-base with main branch."""
         # Create a feature branch with a commit
-        self.subprocess.run(
-            ["git", "checkout", "-b", "feature"],
-            cwd=temp_git_repo,
-            capture_output=True,
-        )
+        self._git(temp_git_repo, "checkout", "-b", "feature")
 
         test_file = temp_git_repo / "test.cpp"
         test_file.write_text("// modified\n")
-        self.subprocess.run(["git", "add", "."], cwd=temp_git_repo, capture_output=True)
-        self.subprocess.run(
-            ["git", "commit", "-m", "Feature change"],
-            cwd=temp_git_repo,
-            capture_output=True,
-        )
+        self._commit(temp_git_repo, "Feature change")
 
         base = ChangesSet.detect_base(temp_git_repo)
         # Should be a commit SHA (the initial commit on main)
         assert len(base) == 40  # Git SHA length
         assert base != "HEAD~1"
 
+    def test_parse_diff_uses_hunk_ranges(self):
+        """Each hunk's new-file range is tracked; deleted files add nothing."""
+        diff = """diff --git a/a.cpp b/a.cpp
+--- a/a.cpp
++++ b/a.cpp
+@@ -1,3 +1,4 @@
+ int main() {
++    int x = 1;
+     return 0;
+ }
+@@ -20,2 +21,3 @@ int helper() {
+ }
++
++int other() {
+diff --git a/gone.cpp b/gone.cpp
+--- a/gone.cpp
++++ /dev/null
+@@ -1,2 +0,0 @@
+-int gone() {
+-}
+"""
+        cs = ChangesSet()
+        cs._parse_diff(diff, Path("repo"))
+
+        regions = cs.uncovered()
+        assert [str(r) for r in regions] == ["repo/a.cpp:1-4", "repo/a.cpp:21-23"]
+
+    def test_parse_diff_body_lines_not_headers(self):
+        """Body lines that look like file headers are counted as part of their hunk."""
+        diff = """diff --git a/a.txt b/a.txt
+--- a/a.txt
++++ b/a.txt
+@@ -1,2 +1,2 @@
+ first
+--- a/other.txt
++++ b/other.txt
+@@ -10 +10 @@
+-ten
++TEN
+"""
+        cs = ChangesSet()
+        cs._parse_diff(diff, Path("repo"))
+
+        assert [str(r) for r in cs.uncovered()] == ["repo/a.txt:1-2", "repo/a.txt:10-10"]
+
     def test_subtract_claims_region(self, temp_git_repo):
         """Subtracting extracted region marks it as documented."""
         test_file = temp_git_repo / "test.cpp"
@@ -403,12 +461,7 @@ int helper() {
         )
 
         # Commit
-        self.subprocess.run(["git", "add", "."], cwd=temp_git_repo, capture_output=True)
-        self.subprocess.run(
-            ["git", "commit", "-m", "Add helper"],
-            cwd=temp_git_repo,
-            capture_output=True,
-        )
+        self._commit(temp_git_repo, "Add helper")
 
         cs = ChangesSet.from_diff(base="HEAD~1", repo_path=temp_git_repo)
 
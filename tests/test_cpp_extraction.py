@@ -4,12 +4,17 @@ Comprehensive test suite for C++ code extraction.
 Tests against a parser interface, not a specific implementation.
 """
 
+import gc
+import weakref
 from pathlib import Path
 
 import pytest
 
 from projected_source.languages.cpp import CppExtractor
 from projected_source.languages.cpp_parser import SimpleCppParser
+from projected_source.languages.macro_definition_finder import MacroDefinitionFinder
+from projected_source.languages.macro_finder_v3 import MacroFinder
+from projected_source.languages.utils import _tree_cache, clear_tree_cache, parse_cached
 
 
 class TestCppParsers:
@@ -166,6 +171,70 @@ class TestCppParsers:
         assert result is not None
         assert "struct DeepStruct" in result.text
 
+    def test_extract_ranges_match_results(self, parser, test_file):
+        """Test that byte ranges locate the same code as the full extraction."""
+        source = test_file.read_bytes()
+
+        struct_range = parser.extract_struct_or_class_range(source, "MyNamespace::NamespacedStruct")
+        struct_result = parser.extract_struct_or_class_by_name(source, "MyNamespace::NamespacedStruct")
+        assert struct_range == (struct_result.start_byte, struct_result.end_byte)
+        assert source[slice(*struct_range)].decode("utf8") == struct_result.text
+
+        function_range = parser.extract_function_range(source, "ClassWithMethods::staticMethod")
+        function_result = parser.extract_function_by_name(source, "ClassWithMethods::staticMethod")
+        assert source[slice(*function_range)].decode("utf8") == function_result.text
+
+        assert parser.extract_function_range(source, "nonexistentFunction") is None
+
+    def test_parse_tree_reused_across_lookups(self, parser, test_file):
+        """Test that repeated lookups on the same source share one parse tree."""
+        source = test_file.read_bytes()
+
+        tree = parser._parse(source)
+        assert parser._parse(source) is tree
+        # Equal content read again from disk hits the cache too
+        assert parser._parse(test_file.read_bytes()) is tree
+        assert parser._parse(source + b"\n") is not tree
+        # The tree lives in the cache shared with the macro finders
+        assert parse_cached(parser.parser, source) is tree
+
+    def test_missing_name_skips_parse(self, test_file):
+        """Test that a name absent from the source bytes is rejected without parsing."""
+        parser = SimpleCppParser()
+        source = test_file.read_bytes()
+        clear_tree_cache()
+
+        assert parser.extract_function_by_name(source, "nonexistentFunction") is None
+        assert parser.extract_struct_or_class_by_name(source, "SimpleStruct::NonexistentStruct") is None
+        assert not _tree_cache
+
+        # Operators are matched even when the source spaces them differently
+        spaced = b"struct V { V operator + (V other) { return other; } };"
+        assert parser.extract_function_by_name(spaced, "V::operator+") is not None
+
+    def test_impossible_shape_skips_parse(self):
+        """Test that names needing syntax absent from the source are rejected without parsing."""
+        parser = SimpleCppParser()
+        clear_tree_cache()
+
+        # A function needs a parameter list; template arguments need a '<'
+        assert parser.extract_function_by_name(b"int count = 2;", "count") is None
+        assert parser.extract_struct_or_class_by_name(b"struct Box { int v; };", "Box<int>") is None
+        assert not _tree_cache
+
+        # Nesting qualifies names even when the source has no "::"
+        nested = b"struct Outer { struct Inner { int v; }; };"
+        assert parser.extract_struct_or_class_by_name(nested, "Outer::Inner") is not None
+
+    def test_function_body_locals_not_indexed(self, parser):
+        """Test that declarations inside function bodies do not shadow top-level ones."""
+        source = b"void f() {\n    int count = 1;\n}\nint count = 2;\n"
+
+        result = parser.extract_struct_or_class_by_name(source, "count")
+        assert result is not None
+        assert result.text == "int count = 2;"
+        assert result.start_line == 4
+
 
 class TestCppExtractor:
     """Test the full CppExtractor with all its features."""
@@ -200,6 +269,106 @@ class TestCppExtractor:
         assert "@@start" not in text
         assert "@@end" not in text
 
+    def test_nested_macro_markers(self, extractor):
+        """Test that a marker section nested in another one is found along with it."""
+        source = b"""DEFINE_JS_FUNCTION(nested, ctx, data) {
+    //@@start outer
+    int a = 1;
+    //@@start inner
+    int b = 2;
+    //@@end inner
+    //@@end outer
+}
+"""
+        info = extractor.macro_finder.find_markers_in_macro(source, "DEFINE_JS_FUNCTION")
+
+        assert info["markers"] == {"inner": (4, 6), "outer": (2, 7)}
+        assert extractor.macro_finder.extract_macro_section(source, "DEFINE_JS_FUNCTION", "inner") == "    int b = 2;"
+
+    def test_macro_section_crlf(self, extractor):
+        """Test that a marked section of a CRLF source comes back with LF line endings."""
+        source = (
+            b"DEFINE_JS_FUNCTION(crlf, ctx, data) {\r\n"
+            b"    //@@start body\r\n"
+            b"    int a = 1;\r\n"
+            b"    int b = 2;\r\n"
+            b"    //@@end body\r\n"
+            b"}\r\n"
+        )
+        text = extractor.macro_finder.extract_macro_section(source, "DEFINE_JS_FUNCTION", "body")
+
+        assert text == "    int a = 1;\n    int b = 2;"
+
+    def test_find_by_arguments_all_filters(self, extractor):
+        """Test that macros are kept only when every argument filter matches."""
+        source = b"""DEFINE_JS_FUNCTION(first, ctx, data) { return 1; }
+DEFINE_JS_FUNCTION(second, ctx, data) { return 2; }
+DEFINE_JS_FUNCTION(second, ctx, other) { return 3; }
+"""
+        finder = extractor.macro_finder
+
+        assert len(finder.find_by_arguments(source, "DEFINE_JS_FUNCTION", {"arg0": "second"})) == 2
+        (result,) = finder.find_by_arguments(source, "DEFINE_JS_FUNCTION", {"arg0": "second", "arg2": "other"})
+        assert result.line == 3
+        assert finder.find_by_arguments(source, "DEFINE_JS_FUNCTION", {"arg5": "second"}) == []
+
+    def test_query_cache_does_not_keep_finders_alive(self, test_file):
+        """Test that compiled queries are cached without holding on to the finder that asked."""
+        source = test_file.read_bytes()
+        finder = MacroDefinitionFinder()
+        assert finder.find_definition(source, "MAX_SIZE") is not None
+        assert finder.find_all_definitions(source, prefix="MAX_")
+
+        ref = weakref.ref(finder)
+        del finder
+        gc.collect()
+        assert ref() is None
+
+    def test_absent_macro_skips_parse(self, extractor):
+        """Test that looking up a macro name absent from the source bytes never parses it."""
+        source = b"int count = LOG_LEVEL;\n"
+        clear_tree_cache()
+
+        assert extractor.macro_finder.find_by_name(source, "DEFINE_JS_FUNCTION") == []
+        assert extractor.macro_finder.find_all(source, ["TRACE", "ASSERT"]) == []
+        assert extractor.macro_def_finder.find_definition(source, "MAX_SIZE") is None
+        assert extractor.macro_def_finder.find_all_definitions(source, prefix="DEFINE_") == []
+        assert not _tree_cache
+
+    def test_identical_macro_bodies_marker_lines(self, extractor):
+        """Test that macros with identical bodies each report markers at their own lines."""
+        body = b"""DEFINE_JS_FUNCTION(same, ctx, data) {
+    //@@start core
+    return 1;
+    //@@end core
+}
+"""
+        source = body + b"\n" + body
+        finder = extractor.macro_finder
+
+        first, second = finder.find_by_name(source, "DEFINE_JS_FUNCTION")
+        assert finder.find_markers_in_node(first.node) == {"core": (2, 4)}
+        assert finder.find_markers_in_node(second.node) == {"core": (8, 10)}
+
+    def test_macro_arguments_non_ascii(self, extractor):
+        """Test that macro arguments are split correctly around multi-byte characters."""
+        source = 'void f() {\n    LOG("héllo wörld", count + 1, ptr[0]);\n}\n'.encode("utf8")
+
+        (result,) = extractor.macro_finder.find_by_name(source, "LOG")
+
+        assert result["arguments"] == ['"héllo wörld"', "count + 1", "ptr[0]"]
+
+    def test_walk_tree_matches_query(self, extractor, test_file):
+        """Test that the tree walk finds the same macros as the query lookup."""
+        source = test_file.read_bytes()
+        finder = extractor.macro_finder
+
+        walked = finder.walk_tree(source, ["DEFINE_JS_FUNCTION"])
+        queried = finder.find_by_name(source, "DEFINE_JS_FUNCTION")
+
+        assert walked
+        assert [(r["line"], r["arguments"]) for r in walked] == [(r["line"], r["arguments"]) for r in queried]
+
     def test_extract_macro_definition(self, extractor, test_file):
         """Test extracting macro definitions."""
         # Simple macro
@@ -217,6 +386,103 @@ class TestCppExtractor:
         assert "do {" in text
         assert "while(0)" in text
 
+    def test_repeated_extractions_share_read(self, extractor, tmp_path):
+        """Test that extractions from one file reuse its contents until the file changes."""
+        header = tmp_path / "macros.h"
+        header.write_text("#define ONE 1\n#define TWO 2\n")
+
+        source = extractor._read(header)
+        assert "#define ONE 1" in extractor.extract_macro_definition(header, "ONE")[0]
+        assert "#define TWO 2" in extractor.extract_macro_definition(header, "TWO")[0]
+        assert extractor._read(header) is source
+
+        header.write_text("#define ONE 1\n#define TWO 2\n#define THREE 3\n")
+        assert "#define THREE 3" in extractor.extract_macro_definition(header, "THREE")[0]
+
+    def test_find_all_definitions_by_prefix(self, extractor, test_file):
+        """Test listing macro definitions filtered by name prefix."""
+        source = test_file.read_bytes()
+        finder = extractor.macro_def_finder
+
+        assert [m.name for m in finder.find_all_definitions(source, prefix="M")] == ["MAX_SIZE", "MIN"]
+        assert [m.name for m in finder.find_all_definitions(source, prefix="DEFINE_")] == ["DEFINE_JS_FUNCTION"]
+        assert finder.find_all_definitions(source, prefix="M.") == []
+        assert len(finder.find_all_definitions(source)) == 4
+
+    def test_find_all_definitions_in_byte_range(self, extractor):
+        """Test that a byte range limits the definitions found to those overlapping it."""
+        source = b"#define ONE 1\n#define TWO 2\n#define THREE 3\n"
+        finder = extractor.macro_def_finder
+        start = source.index(b"#define TWO")
+
+        assert [m.name for m in finder.find_all_definitions(source, byte_range=(start, start + 5))] == ["TWO"]
+        assert [m.name for m in finder.find_all_definitions(source, prefix="T", byte_range=(start, len(source)))] == [
+            "TWO",
+            "THREE",
+        ]
+
+    def test_find_all_definitions_many(self, extractor, test_file):
+        """Test that the process pool finds the same definitions as one finder in-process."""
+        finder = extractor.macro_def_finder
+        sources = [test_file.read_bytes(), b"#define ONE 1\n#define TWO(x) (x)\n", b"int x;\n"]
+
+        expected = [finder.find_all_definitions(source, prefix=None) for source in sources]
+        assert finder.find_all_definitions_many(sources, max_workers=2) == expected
+        assert finder.find_all_definitions_many(sources, max_workers=1) == expected
+        assert [m.name for m in finder.find_all_definitions_many(sources, prefix="T", max_workers=2)[1]] == ["TWO"]
+
+    def test_macro_finders_share_parse_tree(self, extractor, test_file):
+        """Test that the macro finders reuse one parse tree per source."""
+        source = test_file.read_bytes()
+
+        tree = parse_cached(extractor.macro_finder.parser, source)
+        assert parse_cached(extractor.macro_def_finder.parser, source) is tree
+        assert parse_cached(extractor.macro_def_finder.parser, source + b"\n") is not tree
+
+    def test_finder_exit_releases_trees(self, test_file):
+        """Test that leaving a MacroFinder context drops only the trees it parsed."""
+        source = test_file.read_bytes()
+        clear_tree_cache()
+        other = b"#define OTHER 1\n"
+        other_tree = parse_cached(MacroFinder().parser, other)
+
+        with MacroFinder() as finder:
+            finder.find_all(source, ["MIN"])
+            finder.find_all(other, ["OTHER"])
+            tree = parse_cached(finder.parser, source)
+
+        assert parse_cached(finder.parser, source) is not tree
+        assert parse_cached(finder.parser, other) is other_tree
+
+    def test_reparse_after_edit(self, extractor, test_file):
+        """Test that an incrementally reparsed source serves later lookups."""
+        finder = extractor.macro_def_finder
+        source = test_file.read_bytes()
+        # NEW_MACRO is absent from source, so this lookup is skipped without parsing
+        assert finder.find_definition(source, "NEW_MACRO") is None
+        # Parse the original source so reparse can start from its cached tree
+        old_tree = parse_cached(finder.parser, source)
+        assert _tree_cache[(finder.parser.language, source)] is old_tree
+
+        inserted = b"#define NEW_MACRO 1\n"
+        edited = inserted + source
+        tree = finder.reparse(
+            source,
+            edited,
+            start_byte=0,
+            old_end_byte=0,
+            new_end_byte=len(inserted),
+            start_point=(0, 0),
+            old_end_point=(0, 0),
+            new_end_point=(1, 0),
+        )
+
+        assert tree is not old_tree
+        assert parse_cached(finder.parser, edited) is tree
+        assert finder.find_definition(edited, "NEW_MACRO").start_line == 1
+        # The tree for the original source is left intact
+        assert "#define MAX_SIZE 1024" in finder.find_definition(source, "MAX_SIZE").text
+
     def test_extract_lines(self, extractor, test_file):
         """Test extracting specific line ranges."""
         text, start, end = extractor.extract_lines(test_file, 5, 8)
@@ -60,6 +60,33 @@ int main() {
         temp_path.unlink()
 
 
+def test_markers_in_strings_ignored():
+    """Test that marker text inside a string literal is not taken for a marker."""
+    extractor = CppExtractor()
+
+    test_code = b"""
+const char* doc = "//@@start fake";
+
+//@@start real
+int value = 1;
+//@@end real
+
+const char* tail = "//@@end fake";
+"""
+
+    with tempfile.NamedTemporaryFile(suffix=".cpp", delete=False) as f:
+        f.write(test_code)
+        temp_path = Path(f.name)
+
+    try:
+        markers = extractor.find_markers_in_file(temp_path)
+
+        assert markers == {"real": (5, 5)}
+
+    finally:
+        temp_path.unlink()
+
+
 def test_extract_function():
     """Test extracting a function by name."""
     extractor = CppExtractor()
@@ -122,6 +149,7 @@ line 5
 
 if __name__ == "__main__":
     test_find_markers()
+    test_markers_in_strings_ignored()
     test_extract_function()
     test_extract_lines()
     print("✓ All tests passed!")
@@ -167,6 +167,53 @@ class TestOverloadDisambiguation:
         assert any("TMGetLedger" in sig for sig in signatures)
         assert any("TMValidation" in sig for sig in signatures)
 
+    # === Batch extraction tests ===
+
+    def test_extract_many(self, parser, fixture_file):
+        """Test extracting several functions with one parse."""
+        source = fixture_file.read_bytes()
+        results = parser.extract_many(
+            source,
+            [
+                ("PeerImp::onMessage", "TMValidation"),
+                ("handleEvent", "const std::string& name"),
+                ("PeerImp::process", None),
+                ("nonexistentFunction", None),
+            ],
+        )
+
+        assert len(results) == 4
+        assert "processValidation" in results[0].text
+        assert "Handle by name" in results[1].text
+        assert "handleInt" in results[2].text
+        assert results[3] is None
+
+    def test_extract_many_matches_single_lookups(self, parser, fixture_file):
+        """Test that batch extraction agrees with extract_function_by_name."""
+        source = fixture_file.read_bytes()
+        names = [("PeerImp::onMessage", sig) for sig in ("TMProposeSet", "TMTransaction", "TMGetLedger")]
+
+        batch = parser.extract_many(source, names)
+        single = [parser.extract_function_by_name(source, name, signature=sig) for name, sig in names]
+
+        assert [r.start_line for r in batch] == [r.start_line for r in single]
+
+    def test_extract_many_structs(self, parser, fixture_file):
+        """Test batch extraction of structs/classes."""
+        source = fixture_file.read_bytes()
+        results = parser.extract_many(
+            source, [("protocol::TMGetLedger", None), ("PeerImp", None), ("Missing", None)], kind="struct"
+        )
+
+        assert "struct TMGetLedger" in results[0].text
+        assert results[1].text.startswith("class PeerImp")
+        assert results[2] is None
+
+        with pytest.raises(ValueError):
+            parser.extract_many(source, [("PeerImp", "int")], kind="struct")
+        with pytest.raises(ValueError):
+            parser.extract_many(source, [("PeerImp", None)], kind="enum")
+
 
 class TestTemplateFunctionSignatures:
     """Test signature extraction from template functions."""